@@ -1,7 +1,9 @@
 import streamlit as st
 import os
-from summarizer import TextSummarizer
-import time
+from cache import SingleFlight, SummaryCache
+from resilience import CircuitBreaker, RetryPolicy
+from settings import rate_limiter_from_env, summarizer_from_env
+from ingest import preview, scan
 
 # Configure page
 st.set_page_config(
@@ -14,16 +16,71 @@ st.set_page_config(
 if 'summarizer' not in st.session_state:
     st.session_state.summarizer = None
 
+# Progress bar position and status label shown when each pipeline stage starts
+STAGE_PROGRESS = {
+    "preprocess": (10, "🔄 Preparing text..."),
+    "cache": (20, "🗄️ Checking cache..."),
+    "extract": (25, "✂️ Selecting key sentences..."),
+    "prompt": (30, "📝 Building prompt..."),
+    "model": (50, "✨ Generating summary..."),
+    "postprocess": (95, "✅ Finishing up...")
+}
+
+def format_duration(seconds):
+    """Format a stage duration for display"""
+    return f"{seconds * 1000:.0f} ms" if seconds < 1 else f"{seconds:.2f} s"
+
+@st.cache_resource
+def get_summary_cache():
+    """Create the process-wide summary cache shared by all sessions"""
+    return SummaryCache(path=os.getenv("SUMMARY_CACHE_PATH") or None)
+
+@st.cache_resource
+def get_rate_limiter():
+    """Create the process-wide Gemini rate limiter, if budgets are configured"""
+    return rate_limiter_from_env()
+
+@st.cache_resource
+def get_retry_policy():
+    """Create the process-wide retry policy so the retry budget covers all sessions"""
+    return RetryPolicy()
+
+@st.cache_resource
+def get_circuit_breaker():
+    """Create the process-wide circuit breaker so an outage is detected once for all sessions"""
+    return CircuitBreaker()
+
+@st.cache_resource
+def get_single_flight():
+    """Create the process-wide coalescer so identical requests from different sessions share one call"""
+    return SingleFlight()
+
+def session_memo(key, compute):
+    """Compute a value once per session for a given key, so reruns do not rescan uploads"""
+    memo = st.session_state.setdefault("memo", {})
+    if key not in memo:
+        # Only recent files and options matter; keep the memo small
+        if len(memo) >= 16:
+            memo.clear()
+        memo[key] = compute()
+    return memo[key]
+
 def initialize_summarizer():
-    """Initialize the text summarizer with API key"""
+    """Initialize the text summarizer from the environment, sharing process-wide state across sessions"""
     try:
-        api_key = os.getenv("GOOGLE_API_KEY", "")
-        if not api_key:
-            st.error("⚠️ Google API Key not found. Please set the GOOGLE_API_KEY environment variable.")
-            return None
+        options = {}
+        # The app answers with key sentences while Gemini is unavailable unless told otherwise
+        if not os.getenv("EXTRACTIVE_FALLBACK"):
+            options["extractive_fallback"] = True
         
-        summarizer = TextSummarizer(api_key)
-        return summarizer
+        return summarizer_from_env(
+            cache=get_summary_cache(),
+            rate_limiter=get_rate_limiter(),
+            retry_policy=get_retry_policy(),
+            circuit_breaker=get_circuit_breaker(),
+            single_flight=get_single_flight(),
+            **options
+        )
     except Exception as e:
         st.error(f"❌ Failed to initialize summarizer: {str(e)}")
         return None
@@ -70,6 +127,13 @@ def main():
             help="Language for the summary output"
         )
         
+        # Preprocessing profile
+        preserve_unicode = st.checkbox(
+            "Preserve symbols & non-Latin punctuation",
+            value=False,
+            help="Keep dashes, quotes, currency symbols and CJK punctuation instead of stripping them"
+        )
+        
         st.divider()
         st.markdown("### 💡 Tips")
         st.markdown("""
@@ -95,6 +159,7 @@ def main():
         )
         
         input_text = ""
+        uploaded_file = None
         
         if input_method == "Type/Paste Text":
             input_text = st.text_area(
@@ -110,29 +175,57 @@ def main():
             )
             
             if uploaded_file is not None:
+                # Uploads are read in pieces and never decoded into one string
                 try:
-                    input_text = str(uploaded_file.read(), "utf-8")
+                    uploaded_file.seek(0)
                     st.text_area(
                         "File content preview:",
-                        value=input_text[:500] + "..." if len(input_text) > 500 else input_text,
+                        value=preview(uploaded_file),
                         height=200,
                         disabled=True
                     )
                 except Exception as e:
                     st.error(f"Error reading file: {str(e)}")
+                    uploaded_file = None
         
         # Text statistics
-        if input_text:
+        options = {
+            "style": summary_style.lower(),
+            "max_words": summary_length,
+            "language": language.lower(),
+            "normalization": "unicode" if preserve_unicode else "legacy"
+        }
+        token_info = None
+        if uploaded_file is not None:
+            def scan_upload():
+                uploaded_file.seek(0)
+                return scan(uploaded_file)
+            
+            file_stats = session_memo(("stats", uploaded_file.file_id), scan_upload)
+            word_count = file_stats.words
+            char_count = file_stats.chars
+            token_info = session_memo(
+                ("tokens", uploaded_file.file_id, *options.values()),
+                lambda: st.session_state.summarizer.count_file_tokens(uploaded_file, **options)
+            )
+        elif input_text:
             word_count = len(input_text.split())
             char_count = len(input_text)
-            st.info(f"📊 Text Stats: {word_count} words, {char_count} characters")
+            token_info = st.session_state.summarizer.count_tokens(input_text, **options)
+        
+        if token_info is not None:
+            st.info(
+                f"📊 Text Stats: {word_count} words, {char_count} characters, "
+                f"~{token_info['prompt_tokens']} prompt tokens"
+                + (f" ({token_info['model_calls']} model calls, chunked)" if token_info["chunked"] else "")
+            )
     
     with col2:
         st.header("✨ Generated Summary")
         
         # Summary button
         if st.button("🚀 Generate Summary", type="primary", use_container_width=True):
-            if not input_text or len(input_text.strip()) < 50:
+            if token_info is None or char_count < 50:
                 st.warning("⚠️ Please provide at least 50 characters of text for summarization.")
             else:
                 # Show progress
@@ -140,36 +233,49 @@ def main():
                 status_text = st.empty()
                 
                 try:
-                    # Update progress
-                    progress_bar.progress(25)
-                    status_text.text("🔄 Preparing text...")
-                    time.sleep(0.5)
+                    # Drive the progress indicators from the real pipeline stages
+                    def on_stage(stage, duration):
+                        if duration is None:
+                            progress, label = STAGE_PROGRESS.get(stage, (0, stage))
+                            progress_bar.progress(progress)
+                            status_text.text(label)
                     
-                    progress_bar.progress(50)
-                    status_text.text("🤖 Sending to AI model...")
-                    time.sleep(0.5)
-                    
-                    progress_bar.progress(75)
-                    status_text.text("✨ Generating summary...")
-                    
-                    # Generate summary
-                    summary = st.session_state.summarizer.summarize_text(
-                        text=input_text,
-                        style=summary_style.lower(),
-                        max_words=summary_length,
-                        language=language.lower()
-                    )
-                    
-                    progress_bar.progress(100)
-                    status_text.text("✅ Summary generated!")
-                    time.sleep(0.5)
+                    # Stream the summary as the model generates it
+                    results = []
+                    if uploaded_file is not None:
+                        # Large files go through the chunked pipeline piece by piece
+                        stream = st.session_state.summarizer.stream_file(
+                            uploaded_file,
+                            on_stage=on_stage,
+                            on_result=results.append,
+                            **options
+                        )
+                    else:
+                        stream = st.session_state.summarizer.stream_summary(
+                            text=input_text,
+                            on_stage=on_stage,
+                            on_result=results.append,
+                            **options
+                        )
+                    summary_box = st.empty()
+                    summary_box.write_stream(stream)
+                    summary_box.empty()
+                    result = results[0]
+                    summary = result.summary
                     
                     # Clear progress indicators
                     progress_bar.empty()
                     status_text.empty()
                     
                     # Display summary
-                    st.success("Summary generated successfully!")
+                    if result.cache_hit:
+                        st.success("⚡ Summary served from cache!")
+                    elif result.fallback:
+                        st.warning("⚠️ Gemini is unavailable right now; showing key sentences selected from the text instead.")
+                    elif result.truncated:
+                        st.warning("⚠️ The summary was cut off at the output limit; try a shorter summary length.")
+                    else:
+                        st.success("Summary generated successfully!")
                     st.text_area(
                         "Generated Summary:",
                         value=summary,
@@ -178,11 +284,14 @@ def main():
                     )
                     
                     # Summary statistics
-                    summary_words = len(summary.split())
-                    summary_chars = len(summary)
-                    compression_ratio = round((1 - summary_words / word_count) * 100, 1) if word_count > 0 else 0
+                    compression_ratio = round((1 - result.summary_words / word_count) * 100, 1) if word_count > 0 else 0
                     
-                    st.info(f"📈 Summary Stats: {summary_words} words, {summary_chars} characters ({compression_ratio}% compression)")
+                    st.info(f"📈 Summary Stats: {result.summary_words} words, {result.summary_chars} characters ({compression_ratio}% compression)")
+                    st.caption(
+                        f"⏱️ {format_duration(result.latency)} total ("
+                        + " · ".join(f"{stage} {format_duration(seconds)}" for stage, seconds in result.timings.items())
+                        + f") · ~{result.input_tokens} tokens in, ~{result.output_tokens} out · {result.model_name or result.engine}"
+                    )
                     
                     # Download button
                     st.download_button(
@@ -0,0 +1,396 @@
+import asyncio
+import math
+import random
+import re
+import threading
+import time
+from typing import AsyncIterator, Callable, Iterator, Optional, Protocol, Sequence, runtime_checkable
+
+from google.api_core.exceptions import DeadlineExceeded, ResourceExhausted, ServiceUnavailable
+
+from model_pool import ModelPool, shared_pool
+from tokens import CHARS_PER_TOKEN
+
+
+@runtime_checkable
+class ModelBackend(Protocol):
+    """
+    What TextSummarizer needs from a chat model.
+
+    Messages are LangChain messages; every method returns or yields plain
+    text. max_output_tokens caps the response of a single call, overriding
+    the backend's default. Failures are raised as the backend's own
+    exceptions, which the summarizer's retry policy and circuit breaker
+    classify. A response cut off at the output budget is raised as
+    OutputTruncated: invoke carries the text generated so far, stream
+    raises it after its last piece.
+    """
+    model_name: str
+    temperature: float
+    provider: str
+
+    def invoke(self, messages: list, max_output_tokens: Optional[int] = None) -> str:
+        """Generate a complete response"""
+        ...
+
+    async def ainvoke(self, messages: list, max_output_tokens: Optional[int] = None) -> str:
+        """Async counterpart of invoke"""
+        ...
+
+    def stream(self, messages: list, max_output_tokens: Optional[int] = None) -> Iterator[str]:
+        """Yield the response in pieces as it is generated"""
+        ...
+
+    def astream(self, messages: list, max_output_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """Async counterpart of stream"""
+        ...
+
+
+class OutputTruncated(Exception):
+    """A response stopped at its output budget instead of finishing"""
+
+    def __init__(self, content: str = ""):
+        super().__init__("Response was cut off at the output token limit")
+        self.content = content
+
+
+class GeminiBackend:
+    """
+    Google Gemini through LangChain, with clients taken from a ModelPool.
+
+    Per-call output budgets are sent as generation config on the request,
+    so one pooled client serves every budget.
+    """
+
+    provider = "Google"
+
+    def __init__(self, api_key: str, model_name: str = "gemini-1.5-flash", temperature: float = 0.3,
+                 max_tokens: int = 1024, timeout: int = 30, model_pool: Optional[ModelPool] = None):
+        """
+        Initialize the backend
+
+        Args:
+            api_key (str): Google API key for Gemini access
+            model_name (str): Gemini model
+            temperature (float): Sampling temperature
+            max_tokens (int): Output tokens per response when a call sets no budget
+            timeout (int): Timeout in seconds for a single call
+            model_pool (Optional[ModelPool]): Pool the client is taken from;
+                defaults to the process-wide shared pool
+        """
+        self.model_name = model_name
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.model = (model_pool or shared_pool).get(
+            model=model_name,
+            google_api_key=api_key,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=timeout,
+            max_retries=2
+        )
+
+    @staticmethod
+    def _options(max_output_tokens: Optional[int]) -> dict:
+        """Per-call keyword arguments for the LangChain client"""
+        if max_output_tokens is None:
+            return {}
+        return {"generation_config": {"max_output_tokens": max_output_tokens}}
+
+    @staticmethod
+    def _truncated(message) -> bool:
+        """Whether a response or its last streamed chunk stopped at the output budget"""
+        return message.response_metadata.get("finish_reason") == "MAX_TOKENS"
+
+    def invoke(self, messages: list, max_output_tokens: Optional[int] = None) -> str:
+        response = self.model.invoke(messages, **self._options(max_output_tokens))
+        if self._truncated(response):
+            raise OutputTruncated(response.content)
+        return response.content
+
+    async def ainvoke(self, messages: list, max_output_tokens: Optional[int] = None) -> str:
+        response = await self.model.ainvoke(messages, **self._options(max_output_tokens))
+        if self._truncated(response):
+            raise OutputTruncated(response.content)
+        return response.content
+
+    def stream(self, messages: list, max_output_tokens: Optional[int] = None) -> Iterator[str]:
+        chunk = None
+        for chunk in self.model.stream(messages, **self._options(max_output_tokens)):
+            yield chunk.content
+        if chunk is not None and self._truncated(chunk):
+            raise OutputTruncated()
+
+    async def astream(self, messages: list, max_output_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        chunk = None
+        async for chunk in self.model.astream(messages, **self._options(max_output_tokens)):
+            yield chunk.content
+        if chunk is not None and self._truncated(chunk):
+            raise OutputTruncated()
+
+
+class BackendNotConfigured(Exception):
+    """A model call was made to a backend that lacks its credentials or settings"""
+
+
+class UnconfiguredBackend:
+    """
+    Stand-in for a model that has not been configured, such as Gemini without an API key.
+
+    Lets a summarizer that only summarizes locally start without credentials;
+    every model call raises the configuration error instead.
+    """
+
+    provider = "Google"
+
+    def __init__(self, message: str, model_name: str = "gemini-1.5-flash"):
+        """
+        Initialize the backend
+
+        Args:
+            message (str): Message of the BackendNotConfigured error raised by every call
+            model_name (str): Name reported to the summarizer
+        """
+        self.model_name = model_name
+        self.temperature = 0.3
+        self.message = message
+
+    def invoke(self, messages: list, max_output_tokens: Optional[int] = None) -> str:
+        raise BackendNotConfigured(self.message)
+
+    async def ainvoke(self, messages: list, max_output_tokens: Optional[int] = None) -> str:
+        raise BackendNotConfigured(self.message)
+
+    def stream(self, messages: list, max_output_tokens: Optional[int] = None) -> Iterator[str]:
+        raise BackendNotConfigured(self.message)
+        yield
+
+    async def astream(self, messages: list, max_output_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        raise BackendNotConfigured(self.message)
+        yield
+
+
+# Latency distributions: each takes a random.Random and returns seconds
+
+def constant(seconds: float) -> Callable[[random.Random], float]:
+    """Always the same latency"""
+    return lambda rng: seconds
+
+
+def uniform(low: float, high: float) -> Callable[[random.Random], float]:
+    """Latency spread evenly between low and high"""
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal(median: float, sigma: float = 0.5) -> Callable[[random.Random], float]:
+    """Right-skewed latency typical of LLM APIs; sigma controls the tail"""
+    return lambda rng: rng.lognormvariate(math.log(median), sigma)
+
+
+LATENCY_DISTRIBUTIONS = {"constant": constant, "uniform": uniform, "lognormal": lognormal}
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Parse a latency distribution such as "constant:0.2", "uniform:0.1:0.5" or "lognormal:0.8:0.6"
+
+    Raises:
+        ValueError: If the distribution is unknown or its parameters are invalid
+    """
+    name, *params = spec.split(":")
+    if name not in LATENCY_DISTRIBUTIONS:
+        raise ValueError(f"Unknown latency distribution: {name!r} (expected one of {', '.join(LATENCY_DISTRIBUTIONS)})")
+    return LATENCY_DISTRIBUTIONS[name](*(float(param) for param in params))
+
+
+# Transient failures a real deployment sees, as the Google client raises them
+DEFAULT_ERRORS = (
+    lambda: ServiceUnavailable("Fake backend: service unavailable"),
+    lambda: ResourceExhausted("Fake backend: quota exceeded"),
+    lambda: DeadlineExceeded("Fake backend: deadline exceeded"),
+    lambda: ConnectionError("Fake backend: connection reset"),
+)
+
+
+class FakeBackend:
+    """
+    Offline stand-in for a model API, for load and chaos testing.
+
+    Responses are built from the end of the prompt, sized to the word
+    target the prompt asks for and cut off at the call's output budget,
+    which is reported with OutputTruncated like a real model.
+    Latency, failures, overload and streaming cadence are configurable,
+    and a seed makes a run reproducible.
+    """
+
+    provider = "Local fake"
+
+    def __init__(self, latency: Callable[[random.Random], float] = lognormal(0.8, 0.5),
+                 error_rate: float = 0.0, errors: Sequence[Callable[[], Exception]] = DEFAULT_ERRORS,
+                 stream_error_rate: float = 0.0, stream_chunk_words: int = 5, stream_interval: float = 0.02,
+                 max_concurrency: Optional[int] = None, model_name: str = "fake", seed: Optional[int] = None):
+        """
+        Initialize the backend
+
+        Args:
+            latency (Callable): Distribution of the time to a full response, or to the
+                first piece when streaming
+            error_rate (float): Probability that a call fails before responding
+            errors (Sequence[Callable]): Factories for the exceptions raised on failure,
+                picked uniformly
+            stream_error_rate (float): Probability that a stream fails part-way through
+            stream_chunk_words (int): Words per streamed piece
+            stream_interval (float): Seconds between streamed pieces
+            max_concurrency (Optional[int]): Calls beyond this many in flight fail with
+                ResourceExhausted, like a provider shedding load
+            model_name (str): Name reported to the summarizer (part of cache keys)
+            seed (Optional[int]): Seed for reproducible latencies and failures
+        """
+        self.model_name = model_name
+        self.temperature = 0.0
+        self.latency = latency
+        self.error_rate = error_rate
+        self.errors = errors
+        self.stream_error_rate = stream_error_rate
+        self.stream_chunk_words = stream_chunk_words
+        self.stream_interval = stream_interval
+        self.max_concurrency = max_concurrency
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.calls = 0
+        self.failures = 0
+
+    def _begin(self) -> tuple:
+        """
+        Admit a call and draw its latency and fate; the caller must call _end once admitted
+
+        Returns:
+            tuple: (latency, error to raise after the latency or None)
+
+        Raises:
+            ResourceExhausted: If max_concurrency calls are already in flight
+        """
+        with self._lock:
+            self.calls += 1
+            if self.max_concurrency is not None and self.in_flight >= self.max_concurrency:
+                self.failures += 1
+                raise ResourceExhausted("Fake backend: too many concurrent requests")
+            self.in_flight += 1
+            latency = max(self.latency(self._rng), 0.0)
+            if self._rng.random() < self.error_rate:
+                self.failures += 1
+                return latency, self._rng.choice(self.errors)()
+            return latency, None
+
+    def _end(self):
+        """Release a call admitted by _begin"""
+        with self._lock:
+            self.in_flight -= 1
+
+    def _stream_fails_at(self, pieces: int) -> Optional[int]:
+        """Index of the piece a stream breaks at, or None if it completes"""
+        with self._lock:
+            if pieces > 1 and self._rng.random() < self.stream_error_rate:
+                self.failures += 1
+                return self._rng.randrange(1, pieces)
+            return None
+
+    def _respond(self, messages: list, max_output_tokens: Optional[int] = None) -> tuple:
+        """
+        Build a deterministic response from the last words of the prompt
+
+        Returns:
+            tuple: (response, whether it was cut off at max_output_tokens)
+        """
+        prompt = messages[-1].content
+        match = re.search(r"approximately (\d+) words", prompt)
+        target = int(match.group(1)) if match else 50
+        words = re.sub(r"\bSUMMARY:\s*$", "", prompt.strip()).split()
+        response = " ".join(words[-target:]) or "Empty input."
+        if max_output_tokens is not None and len(response) > max_output_tokens * CHARS_PER_TOKEN:
+            # Truncated like a real model that runs out of budget mid-sentence
+            return response[:max_output_tokens * CHARS_PER_TOKEN], True
+        return response, False
+
+    def _complete(self, messages: list, max_output_tokens: Optional[int] = None) -> str:
+        """The full response, raising OutputTruncated if it was cut off"""
+        response, truncated = self._respond(messages, max_output_tokens)
+        if truncated:
+            raise OutputTruncated(response)
+        return response
+
+    def _pieces(self, messages: list, max_output_tokens: Optional[int] = None) -> tuple:
+        """Split the response into streamed pieces; also returns whether it was cut off"""
+        response, truncated = self._respond(messages, max_output_tokens)
+        words = response.split()
+        size = max(self.stream_chunk_words, 1)
+        return [" ".join(words[i:i + size]) + " " for i in range(0, len(words), size)], truncated
+
+    def invoke(self, messages: list, max_output_tokens: Optional[int] = None) -> str:
+        latency, error = self._begin()
+        try:
+            time.sleep(latency)
+            if error is not None:
+                raise error
+            return self._complete(messages, max_output_tokens)
+        finally:
+            self._end()
+
+    async def ainvoke(self, messages: list, max_output_tokens: Optional[int] = None) -> str:
+        latency, error = self._begin()
+        try:
+            await asyncio.sleep(latency)
+            if error is not None:
+                raise error
+            return self._complete(messages, max_output_tokens)
+        finally:
+            self._end()
+
+    def stream(self, messages: list, max_output_tokens: Optional[int] = None) -> Iterator[str]:
+        latency, error = self._begin()
+        try:
+            time.sleep(latency)
+            if error is not None:
+                raise error
+            pieces, truncated = self._pieces(messages, max_output_tokens)
+            fail_at = self._stream_fails_at(len(pieces))
+            for index, piece in enumerate(pieces):
+                if index == fail_at:
+                    raise ConnectionError("Fake backend: stream interrupted")
+                if index:
+                    time.sleep(self.stream_interval)
+                yield piece
+            if truncated:
+                raise OutputTruncated()
+        finally:
+            self._end()
+
+    async def astream(self, messages: list, max_output_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        latency, error = self._begin()
+        try:
+            await asyncio.sleep(latency)
+            if error is not None:
+                raise error
+            pieces, truncated = self._pieces(messages, max_output_tokens)
+            fail_at = self._stream_fails_at(len(pieces))
+            for index, piece in enumerate(pieces):
+                if index == fail_at:
+                    raise ConnectionError("Fake backend: stream interrupted")
+                if index:
+                    await asyncio.sleep(self.stream_interval)
+                yield piece
+            if truncated:
+                raise OutputTruncated()
+        finally:
+            self._end()
+
+    def stats(self) -> dict:
+        """
+        Get call counters
+
+        Returns:
+            dict: Calls, injected failures and calls in flight
+        """
+        with self._lock:
+            return {"calls": self.calls, "failures": self.failures, "in_flight": self.in_flight}
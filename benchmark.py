@@ -0,0 +1,276 @@
+"""
+Local performance benchmarks for the summarizer pipeline.
+
+Usage:
+    python benchmark.py normalize [--size-mb 50]
+    python benchmark.py ingest [--size-mb 2000] [--path corpus.txt]
+    python benchmark.py throughput [--requests 500] [--concurrency 32] [--latency lognormal:0.8:0.5]
+    python benchmark.py extractive [--sizes-kb 20,100,500,2000] [--budget 4000] [--method tfidf]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from ingest import MappedFile, iter_segments, iter_text
+from normalize import normalize_text
+
+ASCII_WORDS = ["the", "quick", "brown", "fox", "jumps", "over", "lazy", "dog.", "report,", "revenue",
+               "(Q3)", "50%", "user@example.com", "#tag", "line\n", "tab\t", "\n\n"]
+MIXED_WORDS = ASCII_WORDS + ["naïve", "café", "—", "€5", "“quoted”", "日本語", "Straße", "…"]
+
+
+def legacy_preprocess(text: str) -> str:
+    """The original two-regex cleaner, kept as the reference implementation"""
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'[^\w\s\.\,\!\?\;\:\-\(\)\[\]\{\}\"\'\/]', '', text)
+    return text.strip()
+
+
+def make_corpus(words: list, size_mb: float, seed: int = 0) -> str:
+    """Build a random text of roughly size_mb million characters"""
+    rng = random.Random(seed)
+    target = int(size_mb * 1_000_000)
+    parts = []
+    length = 0
+    while length < target:
+        word = rng.choice(words)
+        parts.append(word)
+        length += len(word) + 1
+    return " ".join(parts)
+
+
+def measure(func, text: str, repeat: int = 3) -> tuple:
+    """Run func on text and return (best seconds, output)"""
+    best = float("inf")
+    output = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = func(text)
+        best = min(best, time.perf_counter() - start)
+    return best, output
+
+
+def bench_normalize(args):
+    print(f"{'corpus':<8} {'implementation':<16} {'MB/s':>8} {'seconds':>8}  identical")
+    for name, words in (("ascii", ASCII_WORDS), ("mixed", MIXED_WORDS)):
+        text = make_corpus(words, args.size_mb)
+        megabytes = len(text.encode("utf-8")) / 1_000_000
+        reference = None
+        for label, func in (("legacy regex", legacy_preprocess), ("normalize_text", normalize_text)):
+            seconds, output = measure(func, text, args.repeat)
+            if reference is None:
+                reference = output
+            print(f"{name:<8} {label:<16} {megabytes / seconds:>8.1f} {seconds:>8.3f}  {output == reference}")
+
+        # Different output by design, so only throughput is compared
+        seconds, _ = measure(lambda t: normalize_text(t, "unicode"), text, args.repeat)
+        print(f"{name:<8} {'unicode profile':<16} {megabytes / seconds:>8.1f} {seconds:>8.3f}  n/a")
+
+
+def write_corpus(path: str, words: list, size_mb: float, block_mb: float = 8):
+    """Write a corpus of roughly size_mb million characters in blocks, never holding all of it"""
+    with open(path, "w", encoding="utf-8") as f:
+        written = 0
+        seed = 0
+        while written < size_mb:
+            block = make_corpus(words, min(block_mb, size_mb - written), seed)
+            f.write(block + "\n")
+            written += len(block) / 1_000_000
+            seed += 1
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def ingest_worker(args):
+    """Normalize one file with one method and report time and peak RSS as JSON"""
+    start = time.perf_counter()
+    # Hash words rather than text: segment boundaries may collapse double spaces the legacy profile leaves
+    digest = hashlib.sha256()
+    if args.method == "read":
+        with open(args.path, encoding="utf-8", errors="replace") as f:
+            for word in re.finditer(r"\S+", normalize_text(f.read(), args.profile)):
+                digest.update(word.group().encode("utf-8") + b" ")
+    else:
+        with MappedFile(args.path) as f:
+            for segment in iter_segments(iter_text(f), args.profile):
+                for word in re.finditer(r"\S+", segment):
+                    digest.update(word.group().encode("utf-8") + b" ")
+    print(json.dumps({"seconds": time.perf_counter() - start, "peak_rss_mb": peak_rss_mb(),
+                      "digest": digest.hexdigest()}))
+
+
+def bench_ingest(args):
+    # Each method runs in a fresh process so its peak RSS is measured alone
+    path = args.path
+    if path is None:
+        handle, path = tempfile.mkstemp(suffix=".txt")
+        os.close(handle)
+        print(f"Writing a {args.size_mb:g} MB corpus to {path}...")
+        write_corpus(path, MIXED_WORDS, args.size_mb)
+    megabytes = os.path.getsize(path) / 1_000_000
+
+    try:
+        print(f"{'method':<8} {'MB/s':>8} {'seconds':>8} {'peak RSS MB':>12}  same words")
+        reference = None
+        for method in ("read", "mmap"):
+            output = subprocess.run(
+                [sys.executable, __file__, "ingest-worker", method, path, "--profile", args.profile],
+                check=True, capture_output=True, text=True
+            ).stdout
+            report = json.loads(output)
+            if reference is None:
+                reference = report["digest"]
+            print(f"{method:<8} {megabytes / report['seconds']:>8.1f} {report['seconds']:>8.3f} "
+                  f"{report['peak_rss_mb']:>12.1f}  {report['digest'] == reference}")
+    finally:
+        if args.path is None:
+            os.remove(path)
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+def bench_throughput(args):
+    # Imported here so the other benchmarks (and ingest workers' RSS) do not pay for LangChain
+    from backends import FakeBackend, parse_latency
+    from resilience import CircuitBreaker, RetryPolicy
+    from summarizer import TextSummarizer
+
+    backend = FakeBackend(
+        latency=parse_latency(args.latency),
+        error_rate=args.error_rate,
+        max_concurrency=args.backend_concurrency,
+        seed=args.seed
+    )
+    summarizer = TextSummarizer(backend=backend, retry_policy=RetryPolicy(), circuit_breaker=CircuitBreaker())
+    texts = [make_corpus(ASCII_WORDS, args.size_kb / 1000, seed) for seed in range(args.requests)]
+
+    async def run() -> tuple:
+        semaphore = asyncio.Semaphore(args.concurrency)
+        latencies = []
+        failures = []
+
+        async def one(text: str):
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    await summarizer.asummarize_text(text, style=args.style)
+                    latencies.append(time.perf_counter() - start)
+                except Exception as e:
+                    failures.append(str(e))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(text) for text in texts))
+        return time.perf_counter() - start, latencies, failures
+
+    elapsed, latencies, failures = asyncio.run(run())
+    print(f"{args.requests} requests, concurrency {args.concurrency}, latency {args.latency}, "
+          f"error rate {args.error_rate:g}")
+    print(f"throughput   {len(latencies) / elapsed:.1f} summaries/s ({elapsed:.2f} s)")
+    if latencies:
+        print(f"latency      p50 {percentile(latencies, 50):.3f} s  p95 {percentile(latencies, 95):.3f} s  "
+              f"p99 {percentile(latencies, 99):.3f} s")
+    print(f"failed       {len(failures)}")
+    print(f"backend      {backend.stats()}")
+    print(f"retries      {summarizer.retry_policy.stats()}")
+    print(f"breaker      {summarizer.circuit_breaker.stats()}")
+
+
+def bench_extractive(args):
+    # Imported here so the other benchmarks (and ingest workers' RSS) do not pay for LangChain
+    from backends import FakeBackend, parse_latency
+    from summarizer import TextSummarizer
+
+    backend = FakeBackend(latency=parse_latency(args.latency), seed=args.seed)
+    baseline = TextSummarizer(backend=backend)
+    extracting = TextSummarizer(backend=backend, extractive_tokens=args.budget, extractive_method=args.method)
+
+    print(f"budget {args.budget} tokens, method {args.method}, fake latency {args.latency} per call")
+    print(f"{'size':>8} {'tokens':>9} {'kept':>7} {'reduction':>9} {'calls':>9} "
+          f"{'extract s':>9} {'MB/s':>7} {'latency s':>15} {'local MB/s':>10}")
+    for size_kb in (float(size) for size in args.sizes_kb.split(",")):
+        text = make_corpus(ASCII_WORDS, size_kb / 1000, args.seed)
+        before = baseline.count_tokens(text)
+        after = extracting.count_tokens(text)
+
+        timings = {}
+        results = []
+        for summarizer in (baseline, extracting):
+            start = time.perf_counter()
+            results.append(summarizer.summarize_text(text, return_result=True))
+            timings[summarizer] = time.perf_counter() - start
+        extract_seconds = results[1].timings.get("extract", 0.0)
+        megabytes = len(text.encode("utf-8")) / 1_000_000
+
+        # The offline engine end to end, preprocessing included
+        local_seconds, _ = measure(lambda t: baseline.summarize_text(t, engine="extractive"), text, 1)
+
+        print(f"{size_kb:>6g}kB {results[0].input_tokens:>9} {results[1].input_tokens:>7} "
+              f"{results[0].input_tokens / results[1].input_tokens:>8.1f}x "
+              f"{before['model_calls']:>4} -> {after['model_calls']:<2} "
+              f"{extract_seconds:>9.3f} {megabytes / max(extract_seconds, 1e-9):>7.1f} "
+              f"{timings[baseline]:>6.2f} -> {timings[extracting]:<6.2f} {megabytes / local_seconds:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    normalize = subparsers.add_parser("normalize", help="Throughput of input preprocessing")
+    normalize.add_argument("--size-mb", type=float, default=50, help="Corpus size in millions of characters")
+    normalize.add_argument("--repeat", type=int, default=3, help="Runs per implementation (best is reported)")
+    normalize.set_defaults(func=bench_normalize)
+
+    ingest = subparsers.add_parser("ingest", help="Peak memory of reading whole files versus mmap ingestion")
+    ingest.add_argument("--size-mb", type=float, default=2000, help="Size of the generated corpus")
+    ingest.add_argument("--path", help="Existing UTF-8 text file to use instead of a generated corpus")
+    ingest.add_argument("--profile", default="legacy", choices=["legacy", "unicode"], help="Normalization profile")
+    ingest.set_defaults(func=bench_ingest)
+
+    throughput = subparsers.add_parser("throughput", help="End-to-end throughput against the offline fake backend")
+    throughput.add_argument("--requests", type=int, default=500, help="Number of documents to summarize")
+    throughput.add_argument("--concurrency", type=int, default=32, help="Summaries in flight at once")
+    throughput.add_argument("--size-kb", type=float, default=8, help="Size of each document in thousands of characters")
+    throughput.add_argument("--style", default="brief", choices=["brief", "detailed", "bullet points"])
+    throughput.add_argument("--latency", default="lognormal:0.8:0.5", help="Fake latency distribution")
+    throughput.add_argument("--error-rate", type=float, default=0.0, help="Fraction of fake calls that fail")
+    throughput.add_argument("--backend-concurrency", type=int, help="Fake provider concurrency limit")
+    throughput.add_argument("--seed", type=int, default=0, help="Seed for reproducible runs")
+    throughput.set_defaults(func=bench_throughput)
+
+    extractive = subparsers.add_parser("extractive", help="Prompt tokens and model calls saved by extraction")
+    extractive.add_argument("--sizes-kb", default="20,100,500,2000", help="Comma-separated document sizes in kB")
+    extractive.add_argument("--budget", type=int, default=4000, help="Extraction token budget")
+    extractive.add_argument("--method", default="tfidf", choices=["tfidf", "textrank"], help="Sentence scoring")
+    extractive.add_argument("--latency", default="constant:0.5", help="Fake latency distribution")
+    extractive.add_argument("--seed", type=int, default=0, help="Seed for reproducible runs")
+    extractive.set_defaults(func=bench_extractive)
+
+    worker = subparsers.add_parser("ingest-worker")
+    worker.add_argument("method", choices=["read", "mmap"])
+    worker.add_argument("path")
+    worker.add_argument("--profile", default="legacy")
+    worker.set_defaults(func=ingest_worker)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class SummaryCache:
+    """
+    Content-addressed cache for generated summaries.
+
+    Entries live in an in-memory LRU tier and, when a path is given, in a
+    SQLite tier that survives restarts. Both tiers are bounded by entry
+    count and total size in bytes.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024,
+                 path: Optional[str] = None, disk_max_entries: int = 100_000,
+                 disk_max_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries (int): Maximum number of entries kept in memory
+            max_bytes (int): Maximum total size of the in-memory entries
+            path (Optional[str]): SQLite database file for the persistent tier
+            disk_max_entries (int): Maximum number of entries kept on disk
+            disk_max_bytes (int): Maximum total size of the entries kept on disk
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_max_entries = disk_max_entries
+        self.disk_max_bytes = disk_max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._db = None
+        self._disk_entries = 0
+        self._disk_bytes = 0
+
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS summaries_accessed ON summaries (accessed)")
+            self._db.commit()
+            # Sizes of the disk tier are tracked in memory from here on, so writes never scan the table
+            self._disk_entries, self._disk_bytes = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM summaries"
+            ).fetchone()
+
+    @staticmethod
+    def make_key(text: str, style: str, max_words: int, language: str, model_name: str, temperature: float) -> str:
+        """
+        Build the cache key for a summarization request
+
+        Args:
+            text (str): Preprocessed input text
+            style (str): Summary style
+            max_words (int): Maximum words in the summary
+            language (str): Output language
+            model_name (str): Model used to generate the summary
+            temperature (float): Sampling temperature of the model
+
+        Returns:
+            str: Hex digest identifying the request
+        """
+        digest = SummaryCache.key_hasher(style, max_words, language, model_name, temperature)
+        digest.update(text.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def key_hasher(style: str, max_words: int, language: str, model_name: str, temperature: float):
+        """
+        Start a cache key for text that is fed in pieces
+
+        Updating the returned hash with the UTF-8 encoded text, in any number
+        of steps, and taking hexdigest() gives the same key as make_key.
+
+        Returns:
+            hashlib hash object primed with the summary options
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{style}\0{max_words}\0{language}\0{model_name}\0{temperature}\0".encode("utf-8"))
+        return digest
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a summary, promoting disk hits into memory
+
+        Args:
+            key (str): Cache key from make_key
+
+        Returns:
+            Optional[str]: Cached summary, or None on a miss
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+            if self._db is not None:
+                row = self._db.execute("SELECT value FROM summaries WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE summaries SET accessed = ? WHERE key = ?", (time.time(), key))
+                    self._db.commit()
+                    self._remember(key, row[0])
+                    self.hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str):
+        """
+        Store a summary in every tier
+
+        Args:
+            key (str): Cache key from make_key
+            value (str): Summary to store
+        """
+        with self._lock:
+            self._remember(key, value)
+
+            if self._db is not None:
+                size = len(value.encode("utf-8"))
+                old = self._db.execute("SELECT size FROM summaries WHERE key = ?", (key,)).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO summaries (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                    (key, value, size, time.time())
+                )
+                self._disk_entries += old is None
+                self._disk_bytes += size - (old[0] if old is not None else 0)
+                self._evict_disk()
+                self._db.commit()
+
+    def clear(self):
+        """Remove every entry from all tiers"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM summaries")
+                self._db.commit()
+                self._disk_entries = self._disk_bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Get cache statistics
+
+        Returns:
+            dict: Hit/miss counters and in-memory usage
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "persistent": self._db is not None
+            }
+
+    def _remember(self, key: str, value: str):
+        """Insert into the memory tier and evict least recently used entries; caller holds the lock"""
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old.encode("utf-8"))
+
+        self._entries[key] = value
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted.encode("utf-8"))
+
+    def _evict_disk(self):
+        """Drop least recently used rows until the disk tier is within bounds; caller holds the lock"""
+        if self._disk_entries <= self.disk_max_entries and self._disk_bytes <= self.disk_max_bytes:
+            return
+
+        excess = self._disk_entries - self.disk_max_entries
+        stale = freed = 0
+        # Walk the accessed index from the oldest row only as far as needed
+        rows = self._db.execute("SELECT size FROM summaries ORDER BY accessed")
+        for (size,) in rows:
+            if stale >= excess and self._disk_bytes - freed <= self.disk_max_bytes:
+                break
+            stale += 1
+            freed += size
+        rows.close()
+
+        self._db.execute(
+            "DELETE FROM summaries WHERE key IN (SELECT key FROM summaries ORDER BY accessed LIMIT ?)", (stale,)
+        )
+        self._disk_entries -= stale
+        self._disk_bytes -= freed
+
+
+class FlightAbandoned(Exception):
+    """The leader of a shared call stopped before it finished; waiters claim the key again"""
+
+
+class _Flight:
+    """One in-flight call and the waiters sharing its outcome"""
+
+    def __init__(self, future=None):
+        self.done = threading.Event()
+        self.future = future
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one execution.
+
+    The first caller for a key (the leader) runs the call; callers arriving
+    while it is in flight wait for it and receive the same result (or
+    error). If the leader is cancelled instead, for example because its
+    client disconnected, waiters get FlightAbandoned and claim the key
+    again, so one of them takes over the call. Nothing is remembered once
+    the call completes; caching is left to SummaryCache. Async callers are
+    coalesced per event loop.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def claim(self, key: str) -> tuple:
+        """
+        Join the call in flight for key, or become its leader
+
+        A leader must call resolve exactly once when its call finishes.
+
+        Args:
+            key (str): Identity of the call
+
+        Returns:
+            tuple: (flight, leader) where leader is True if the caller must run the call
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return flight, False
+            flight = self._flights[key] = _Flight()
+            self.executed += 1
+            return flight, True
+
+    async def aclaim(self, key: str) -> tuple:
+        """Async counterpart of claim; the flight can be awaited with await_result"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            flight = self._flights.get((id(loop), key))
+            if flight is not None:
+                self.coalesced += 1
+                return flight, False
+            flight = self._flights[(id(loop), key)] = _Flight(loop.create_future())
+            self.executed += 1
+            return flight, True
+
+    def resolve(self, key: str, flight: _Flight, result=None, error: Optional[BaseException] = None):
+        """
+        Publish the leader's outcome to every waiter and release the key
+
+        An error that is not an Exception (cancellation, GeneratorExit) is
+        the leader's own and is not shared; waiters get FlightAbandoned.
+
+        Args:
+            key (str): Identity of the call, as passed to claim or aclaim
+            flight (_Flight): Flight returned to the leader
+            result: Result of the call
+            error (Optional[BaseException]): Error raised by the call, if it failed
+        """
+        with self._lock:
+            flight_key = key if flight.future is None else (id(flight.future.get_loop()), key)
+            if self._flights.get(flight_key) is flight:
+                del self._flights[flight_key]
+
+        if error is not None and not isinstance(error, Exception):
+            # Cancellation of the leader must not fail or cancel its waiters
+            error = FlightAbandoned("The shared request was abandoned by its leader")
+
+        flight.result, flight.error = result, error
+        flight.done.set()
+        if flight.future is not None and not flight.future.done():
+            if error is None:
+                flight.future.set_result(result)
+            else:
+                flight.future.set_exception(error)
+                # Mark the exception as retrieved when nobody was waiting
+                flight.future.exception()
+
+    def wait(self, flight: _Flight):
+        """
+        Block until the leader resolves a flight
+
+        Returns:
+            The leader's result; the leader's error is raised instead if it failed
+
+        Raises:
+            FlightAbandoned: If the leader stopped before finishing; claim the key again
+        """
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    async def await_result(self, flight: _Flight):
+        """Async counterpart of wait for flights claimed with aclaim"""
+        # Shield so one cancelled waiter does not cancel the shared result
+        return await asyncio.shield(flight.future)
+
+    def do(self, key: str, func) -> tuple:
+        """
+        Run func once for all concurrent callers with the same key
+
+        Args:
+            key (str): Identity of the call
+            func (Callable): Zero-argument function performing the call
+
+        Returns:
+            tuple: (result, shared) where shared is True if another caller ran func
+        """
+        while True:
+            flight, leader = self.claim(key)
+            if leader:
+                break
+            try:
+                return self.wait(flight), True
+            except FlightAbandoned:
+                continue
+
+        try:
+            result = func()
+        except BaseException as e:
+            self.resolve(key, flight, error=e)
+            raise
+        self.resolve(key, flight, result)
+        return result, False
+
+    async def ado(self, key: str, func) -> tuple:
+        """
+        Async counterpart of do
+
+        Args:
+            key (str): Identity of the call
+            func (Callable): Zero-argument coroutine function performing the call
+
+        Returns:
+            tuple: (result, shared) where shared is True if another caller ran func
+        """
+        while True:
+            flight, leader = await self.aclaim(key)
+            if leader:
+                break
+            try:
+                return await self.await_result(flight), True
+            except FlightAbandoned:
+                continue
+
+        try:
+            result = await func()
+        except BaseException as e:
+            self.resolve(key, flight, error=e)
+            raise
+        self.resolve(key, flight, result)
+        return result, False
+
+    def stats(self) -> dict:
+        """
+        Get coalescing counters
+
+        Returns:
+            dict: Executed calls, coalesced callers and calls currently in flight
+        """
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._flights)
+            }
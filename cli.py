@@ -0,0 +1,267 @@
+"""
+Summarize files, directories and JSONL corpora from the command line.
+
+Usage:
+    python cli.py docs/ notes.md corpus.jsonl -o summaries.jsonl [--concurrency 8]
+    cat corpus.jsonl | python cli.py - -o summaries.jsonl
+
+Directories are searched recursively for --extensions files. JSONL inputs
+hold one object per line with the text in --text-field and an optional
+identifier in --id-field. Files are memory-mapped and summarized piece by
+piece, so multi-GB inputs are never loaded whole.
+
+Results are appended to the output as they complete, one JSON object per
+line. Completed items are recorded in a checkpoint file (default:
+OUTPUT.checkpoint), so rerunning the same command skips them and resumes
+where the previous run stopped. Failed items are not checkpointed and are
+retried on the next run.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from ingest import DEFAULT_CHUNK_SIZE, MappedFile
+from settings import summarizer_from_env
+from summarizer import TextSummarizer
+
+
+def item_hash(item_id: str, options: dict, parts: Iterable[bytes]) -> str:
+    """
+    Identify an item together with the options it is summarized with
+
+    Args:
+        item_id (str): Item identifier
+        options (dict): Summary options
+        parts (Iterable[bytes]): UTF-8 content of the item, in any number of pieces
+
+    Returns:
+        str: Hex digest recorded in the checkpoint once the item is done
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{item_id}\0{json.dumps(options, sort_keys=True)}\0".encode("utf-8"))
+    for part in parts:
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def file_hash(item_id: str, options: dict, path: str) -> str:
+    """item_hash of a file, read through a memory map"""
+    with MappedFile(path) as f:
+        return item_hash(item_id, options, iter(lambda: f.read(DEFAULT_CHUNK_SIZE), b""))
+
+
+def read_jsonl(lines, source: str, text_field: str, id_field: str) -> Iterator[Tuple[str, str, None]]:
+    """Yield (id, text, None) for each object in a JSONL stream"""
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            text = record[text_field]
+            if not isinstance(text, str):
+                raise TypeError(text_field)
+        except (json.JSONDecodeError, KeyError, TypeError):
+            print(f"Skipping {source}:{number}: expected a JSON object with a string {text_field!r} field",
+                  file=sys.stderr)
+            continue
+        yield str(record.get(id_field, f"{source}:{number}")), text, None
+
+
+def iter_items(paths: list, extensions: tuple, text_field: str,
+               id_field: str) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+    """
+    Yield every document in the inputs, lazily
+
+    JSONL records carry their text; plain files are yielded by path and
+    only read when they are summarized.
+
+    Args:
+        paths (list): Files, directories, JSONL files or "-" for JSONL on stdin
+        extensions (tuple): File extensions picked up from directories
+        text_field (str): JSONL field holding the text
+        id_field (str): JSONL field holding the item identifier
+
+    Yields:
+        Tuple[str, Optional[str], Optional[str]]: Item identifier, text and file path;
+            exactly one of text and path is set
+    """
+    for path in paths:
+        if path == "-":
+            yield from read_jsonl(sys.stdin, "stdin", text_field, id_field)
+        elif os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith(extensions):
+                        yield os.path.join(root, name), None, os.path.join(root, name)
+        elif path.endswith(".jsonl"):
+            with open(path, encoding="utf-8") as f:
+                yield from read_jsonl(f, path, text_field, id_field)
+        else:
+            yield path, None, path
+
+
+def load_checkpoint(path: str) -> set:
+    """Read the hashes of completed items; a missing file means nothing is done yet"""
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+async def run(summarizer: TextSummarizer, items: Iterator[Tuple[str, Optional[str], Optional[str]]],
+              output, checkpoint, done: set, options: dict, concurrency: int,
+              progress_every: Optional[int] = 100) -> dict:
+    """
+    Summarize items with at most concurrency in flight, writing each result as it completes
+
+    Items are pulled from the iterator only as capacity frees up, so the
+    corpus is never held in memory as a whole. Files are hashed and
+    summarized through memory maps on worker threads.
+
+    Args:
+        summarizer (TextSummarizer): Summarizer to use
+        items (Iterator[Tuple[str, Optional[str], Optional[str]]]): (id, text, path) items
+        output: Text file receiving one JSON result per line
+        checkpoint: Text file receiving the hash of each completed item
+        done (set): Hashes of items completed by earlier runs
+        options (dict): Summary options passed to asummarize_text and summarize_file
+        concurrency (int): Maximum number of items summarized at once
+        progress_every (Optional[int]): Report progress on stderr every this many items
+
+    Returns:
+        dict: Counts of succeeded, failed and skipped items
+    """
+    counts = {"succeeded": 0, "failed": 0, "skipped": 0}
+    start = time.perf_counter()
+
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    def summarize_path(path: str):
+        with MappedFile(path) as f:
+            return summarizer.summarize_file(f, return_result=True, **options)
+
+    async def summarize(item_id: str, text: Optional[str], path: Optional[str], key: str) -> tuple:
+        try:
+            if path is not None:
+                result = await loop.run_in_executor(executor, summarize_path, path)
+            else:
+                result = await summarizer.asummarize_text(text, return_result=True, **options)
+            return item_id, key, result, None
+        except Exception as e:
+            return item_id, key, None, str(e)
+
+    def write(item_id: str, key: str, result, error: Optional[str]):
+        if error is None:
+            record = {"id": item_id, "summary": result.summary, "input_tokens": result.input_tokens,
+                      "output_tokens": result.output_tokens, "cache_hit": result.cache_hit, "engine": result.engine,
+                      "model_name": result.model_name, "truncated": result.truncated,
+                      "latency": round(result.latency, 3)}
+        else:
+            record = {"id": item_id, "error": error}
+        output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        output.flush()
+
+        # The checkpoint is written after the result, so a crash in between
+        # repeats the item instead of losing it
+        if error is None:
+            checkpoint.write(key + "\n")
+            checkpoint.flush()
+            counts["succeeded"] += 1
+        else:
+            counts["failed"] += 1
+
+        finished = counts["succeeded"] + counts["failed"]
+        if progress_every and finished % progress_every == 0:
+            elapsed = time.perf_counter() - start
+            print(f"{finished} done ({counts['failed']} failed, {counts['skipped']} skipped), "
+                  f"{finished / elapsed:.1f} items/s", file=sys.stderr)
+
+    pending = set()
+    try:
+        for item_id, text, path in items:
+            if path is not None:
+                try:
+                    key = await loop.run_in_executor(executor, file_hash, item_id, options, path)
+                except OSError as e:
+                    write(item_id, None, None, str(e))
+                    continue
+            else:
+                key = item_hash(item_id, options, [text.encode("utf-8", "surrogatepass")])
+            if key in done:
+                counts["skipped"] += 1
+                continue
+            done.add(key)
+
+            if len(pending) >= concurrency:
+                finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    write(*task.result())
+            pending.add(asyncio.create_task(summarize(item_id, text, path, key)))
+
+        for task in asyncio.as_completed(pending):
+            write(*await task)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="Files, directories, JSONL files, or - for JSONL on stdin")
+    parser.add_argument("-o", "--output", required=True, help="JSONL file results are appended to")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: OUTPUT.checkpoint)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Documents summarized at once")
+    parser.add_argument("--style", default="brief", choices=["brief", "detailed", "bullet points"])
+    parser.add_argument("--max-words", type=int, default=150, help="Maximum words per summary")
+    parser.add_argument("--language", default="english", help="Output language")
+    parser.add_argument("--normalization", choices=["legacy", "unicode"], help="Input preprocessing profile")
+    parser.add_argument("--engine", choices=["abstractive", "extractive"],
+                        help="Summarization engine; extractive runs locally without any model call")
+    parser.add_argument("--route", help="Model route to use for every item instead of routing by size and style")
+    parser.add_argument("--text-field", default="text", help="JSONL field holding the text")
+    parser.add_argument("--id-field", default="id", help="JSONL field holding the item identifier")
+    parser.add_argument("--extensions", default=".txt,.md", help="Comma-separated extensions read from directories")
+    parser.add_argument("--progress-every", type=int, default=100, help="Report progress every N items (0 disables)")
+    parser.add_argument("--log-level", default="warning", help="Logging level; info shows routing decisions")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    load_dotenv()
+    summarizer = summarizer_from_env(max_concurrency=args.concurrency,
+                                     **({"engine": args.engine} if args.engine else {}))
+    options = {"style": args.style, "max_words": args.max_words, "language": args.language}
+    if args.normalization:
+        options["normalization"] = args.normalization
+    if args.engine:
+        options["engine"] = args.engine
+    if args.route:
+        options["route"] = args.route
+
+    checkpoint_path = args.checkpoint or args.output + ".checkpoint"
+    done = load_checkpoint(checkpoint_path)
+    if done:
+        print(f"Resuming: {len(done)} items already completed", file=sys.stderr)
+
+    items = iter_items(args.inputs, tuple(args.extensions.split(",")), args.text_field, args.id_field)
+    with open(args.output, "a", encoding="utf-8") as output, open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+        counts = asyncio.run(run(summarizer, items, output, checkpoint, done, options,
+                                 args.concurrency, args.progress_every))
+
+    print(f"{counts['succeeded']} succeeded, {counts['failed']} failed, {counts['skipped']} skipped", file=sys.stderr)
+    sys.exit(1 if counts["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+import math
+import re
+from typing import Iterable, List
+
+import numpy as np
+
+from tokens import CHARS_PER_TOKEN, estimate_tokens
+
+# Sentence boundaries, as used for chunking long documents
+_SENTENCE_END = re.compile(r'(?<=[\.\!\?])\s+')
+_WORD = re.compile(r"\w+")
+
+# Sentences longer than this are split on spaces, so text without
+# punctuation still yields units that fit a budget
+MAX_SENTENCE_CHARS = 1000
+
+# TextRank builds a dense sentence-by-sentence similarity matrix; above this
+# many sentences the linear TF-IDF centroid score is used instead
+TEXTRANK_MAX_SENTENCES = 2000
+
+# Feature dimensions sentence vectors are hashed into for pairwise similarity
+_FEATURES = 2048
+
+# Highest-scoring sentences considered for a summary; MMR only reranks these
+MMR_CANDIDATES = 200
+
+# Candidates at least this similar to a chosen sentence are treated as duplicates
+DUPLICATE_SIMILARITY = 0.8
+
+# Tokens of candidate sentences kept per summary word from each segment of a file
+CANDIDATE_TOKENS_PER_WORD = 4
+
+# Least candidate tokens kept from each segment when a file is extracted, so
+# large files still contribute whole sentences rather than word fragments
+MIN_SEGMENT_CANDIDATE_TOKENS = 256
+
+METHODS = ("tfidf", "textrank")
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below between both
+but by can could did do does doing down during each few for from further had has have having he her here hers
+him his how i if in into is it its itself just me more most my no nor not now of off on once only or other our
+ours out over own same she should so some such than that the their theirs them then there these they this those
+through to too under until up very was we were what when where which while who whom why will with would you your
+""".split())
+
+
+def split_sentences(text: str, max_chars: int = MAX_SENTENCE_CHARS) -> List[str]:
+    """
+    Split cleaned text into sentences, breaking overly long ones on spaces
+
+    Args:
+        text (str): Cleaned text
+        max_chars (int): Longest sentence kept whole
+
+    Returns:
+        List[str]: Non-empty sentences in document order
+    """
+    max_chars = max(max_chars, 1)
+    sentences = []
+    for sentence in _SENTENCE_END.split(text):
+        sentence = sentence.strip()
+        # Walk an offset instead of slicing off the rest, which is quadratic for small max_chars
+        start = 0
+        while len(sentence) - start > max_chars:
+            cut = sentence.rfind(" ", start, start + max_chars)
+            if cut <= start:
+                cut = start + max_chars
+            piece = sentence[start:cut].strip()
+            if piece:
+                sentences.append(piece)
+            start = cut
+            while start < len(sentence) and sentence[start].isspace():
+                start += 1
+        if start < len(sentence):
+            sentences.append(sentence[start:])
+    return sentences
+
+
+def _term_weights(sentences: List[str]) -> tuple:
+    """
+    Sparse L2-normalized TF-IDF vectors of the sentences
+
+    Returns:
+        tuple: (rows, cols, weights, vocabulary size) describing the nonzero entries
+    """
+    vocabulary = {}
+    ids = []
+    counts = np.empty(len(sentences), dtype=np.int64)
+    for i, sentence in enumerate(sentences):
+        terms = [term for term in _WORD.findall(sentence.lower()) if term not in STOPWORDS]
+        ids.extend(vocabulary.setdefault(term, len(vocabulary)) for term in terms)
+        counts[i] = len(terms)
+
+    size = max(len(vocabulary), 1)
+    rows = np.repeat(np.arange(len(sentences), dtype=np.int64), counts)
+    cols = np.asarray(ids, dtype=np.int64)
+
+    # Collapse repeated terms within a sentence into term frequencies
+    pairs, tf = np.unique(rows * size + cols, return_counts=True)
+    rows, cols = pairs // size, pairs % size
+
+    df = np.bincount(cols, minlength=size)
+    idf = np.log((1 + len(sentences)) / (1 + df)) + 1
+    weights = (1 + np.log(tf)) * idf[cols]
+    norms = np.sqrt(np.bincount(rows, weights * weights, minlength=len(sentences)))
+    weights /= np.maximum(norms, 1e-12)[rows]
+    return rows, cols, weights, size
+
+
+def _vectors(rows: np.ndarray, cols: np.ndarray, weights: np.ndarray, selected: np.ndarray, n: int) -> np.ndarray:
+    """Dense, hashed and L2-normalized TF-IDF vectors of the selected sentences (out of n), one row each"""
+    position = np.full(n, -1, dtype=np.int64)
+    position[selected] = np.arange(len(selected))
+    mask = position[rows] >= 0
+    vectors = np.zeros((len(selected), _FEATURES), dtype=np.float32)
+    np.add.at(vectors, (position[rows[mask]], cols[mask] % _FEATURES), weights[mask])
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    return vectors
+
+
+def score_sentences(sentences: List[str], method: str = "tfidf") -> np.ndarray:
+    """
+    Score how central each sentence is to the document
+
+    "tfidf" scores each sentence by cosine similarity to the document's
+    TF-IDF centroid, in time linear in the text length. "textrank" runs
+    PageRank over the sentence similarity graph; it is quadratic in the
+    number of sentences, so longer documents fall back to "tfidf".
+
+    Args:
+        sentences (List[str]): Sentences of one document
+        method (str): "tfidf" or "textrank"
+
+    Returns:
+        np.ndarray: One non-negative score per sentence
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown extractive method: {method!r} (expected one of {', '.join(METHODS)})")
+    if not sentences:
+        return np.zeros(0)
+    return _score(sentences, method)[0]
+
+
+def _score(sentences: List[str], method: str) -> tuple:
+    """score_sentences, also returning the sparse TF-IDF vectors (see _term_weights)"""
+    n = len(sentences)
+    rows, cols, weights, size = _term_weights(sentences)
+
+    if method == "textrank" and 1 < n <= TEXTRANK_MAX_SENTENCES:
+        vectors = _vectors(rows, cols, weights, np.arange(n), n)
+        similarity = vectors @ vectors.T
+        np.fill_diagonal(similarity, 0)
+        totals = similarity.sum(axis=1, keepdims=True)
+        transition = np.divide(similarity, totals, out=np.full_like(similarity, 1 / n), where=totals > 0)
+
+        scores = np.full(n, 1 / n, dtype=np.float32)
+        for _ in range(50):
+            updated = 0.15 / n + 0.85 * (transition.T @ scores)
+            converged = np.abs(updated - scores).sum() < 1e-6
+            scores = updated
+            if converged:
+                break
+    else:
+        centroid = np.bincount(cols, weights, minlength=size) / n
+        scores = np.bincount(rows, weights * centroid[cols], minlength=n)
+    return scores, (rows, cols, weights)
+
+
+def extract(text: str, max_tokens: int, method: str = "tfidf") -> str:
+    """
+    Keep the most salient sentences of text within a token budget
+
+    Sentences are taken in order of score, skipping any that no longer
+    fit, then put back in document order.
+
+    Args:
+        text (str): Cleaned text
+        max_tokens (int): Token budget (estimated, see tokens.estimate_tokens)
+        method (str): Sentence scoring method, "tfidf" or "textrank"
+
+    Returns:
+        str: Selected sentences joined with spaces; text itself if it already fits
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    # Small budgets get small units, so at least one of them fits
+    sentences = split_sentences(text, min(MAX_SENTENCE_CHARS, int(max_tokens * CHARS_PER_TOKEN) // 2))
+    scores = score_sentences(sentences, method)
+    # Each sentence also pays for the space that joins it to the next
+    costs = [estimate_tokens(sentence + " ") for sentence in sentences]
+    cheapest = min(costs, default=0)
+
+    keep = []
+    remaining = max_tokens
+    for i in np.argsort(-scores, kind="stable"):
+        if costs[i] <= remaining:
+            keep.append(i)
+            remaining -= costs[i]
+            if remaining < cheapest:
+                break
+    return " ".join(sentences[i] for i in sorted(keep))
+
+
+def budget_share(max_tokens: int, part_tokens: int, total_tokens: int) -> int:
+    """Split a token budget across parts of a document in proportion to their size"""
+    return math.floor(max_tokens * part_tokens / max(total_tokens, 1))
+
+
+def extract_segments(segments: Iterable[str], max_tokens: int, total_tokens: int, method: str = "tfidf") -> str:
+    """
+    extract for text that arrives in pieces, such as a large file
+
+    Each segment keeps its best sentences within its share of the budget,
+    but never less than MIN_SEGMENT_CANDIDATE_TOKENS; the result is then
+    selected among these candidates as a whole.
+
+    Args:
+        segments (Iterable[str]): Normalized segments in document order
+        max_tokens (int): Token budget for the result
+        total_tokens (int): Estimated tokens of all segments together
+        method (str): Sentence scoring method, "tfidf" or "textrank"
+
+    Returns:
+        str: Selected sentences joined with spaces
+    """
+    floor = min(max_tokens, MIN_SEGMENT_CANDIDATE_TOKENS)
+    candidates = " ".join(filter(None, (
+        extract(segment, max(budget_share(max_tokens, estimate_tokens(segment), total_tokens), floor), method)
+        for segment in segments
+    )))
+    return extract(candidates, max_tokens, method)
+
+
+def summarize(text: str, max_words: int = 150, style: str = "brief", method: str = "tfidf",
+              diversity: float = 0.3) -> str:
+    """
+    Summarize text locally by selecting sentences, without any model call
+
+    The highest-scoring sentences are reranked with maximal marginal
+    relevance, so each pick trades its score against its similarity to the
+    sentences already chosen and near-duplicates are skipped. Sentences
+    are added while they fit in max_words and returned in document order.
+
+    Args:
+        text (str): Cleaned text
+        max_words (int): Maximum words in the summary
+        style (str): "bullet points" puts one sentence per line; other styles give a paragraph
+        method (str): Sentence scoring method, "tfidf" or "textrank"
+        diversity (float): Weight of redundancy against relevance, from 0 to 1
+
+    Returns:
+        str: Summary in the language of the input
+    """
+    sentences = split_sentences(text)
+    if not sentences:
+        return ""
+    if method not in METHODS:
+        raise ValueError(f"Unknown extractive method: {method!r} (expected one of {', '.join(METHODS)})")
+    scores, (rows, cols, weights) = _score(sentences, method)
+
+    candidates = np.argsort(-scores, kind="stable")[:MMR_CANDIDATES]
+    vectors = _vectors(rows, cols, weights, candidates, len(sentences))
+    relevance = scores[candidates] / max(float(scores[candidates].max()), 1e-12)
+    lengths = np.array([len(sentences[i].split()) for i in candidates])
+
+    redundancy = np.zeros(len(candidates), dtype=np.float32)
+    available = lengths <= max_words
+    chosen = []
+    remaining = max_words
+    while available.any():
+        gain = np.where(available, (1 - diversity) * relevance - diversity * redundancy, -np.inf)
+        best = int(np.argmax(gain))
+        chosen.append(candidates[best])
+        remaining -= lengths[best]
+        redundancy = np.maximum(redundancy, vectors @ vectors[best])
+        available &= (lengths <= remaining) & (redundancy < DUPLICATE_SIMILARITY)
+        available[best] = False
+
+    if chosen:
+        picked = [sentences[i] for i in sorted(chosen)]
+    else:
+        # Every candidate is longer than the summary; cut the best one short
+        picked = [" ".join(sentences[candidates[0]].split()[:max_words])]
+
+    if style == "bullet points":
+        return "\n".join(f"• {sentence}" for sentence in picked)
+    return " ".join(picked)
+
+
+def summarize_segments(segments: Iterable[str], max_words: int = 150, style: str = "brief",
+                       method: str = "tfidf", diversity: float = 0.3) -> str:
+    """
+    summarize for text that arrives in pieces, such as a large file
+
+    Each segment contributes its best sentences as candidates, so only the
+    candidates are held in memory; the summary is selected among them.
+
+    Args:
+        segments (Iterable[str]): Normalized segments in document order
+        max_words, style, method, diversity: As for summarize
+
+    Returns:
+        str: Summary in the language of the input
+    """
+    budget = CANDIDATE_TOKENS_PER_WORD * max_words
+    candidates = " ".join(filter(None, (extract(segment, budget, method) for segment in segments)))
+    return summarize(candidates, max_words, style, method, diversity)
@@ -0,0 +1,201 @@
+import codecs
+import mmap
+import os
+from dataclasses import dataclass, field
+from typing import BinaryIO, Iterable, Iterator
+
+from normalize import normalize_text
+from tokens import estimate_tokens
+
+# Bytes read from a stream per step; large enough to amortize per-call overhead,
+# small enough that a few copies of it do not matter
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# A piece with no whitespace in this many characters is cut anyway, so a
+# pathological input cannot grow the carried-over word without bound
+MAX_CARRY = 64 * 1024
+
+
+class MappedFile:
+    """
+    Read-only memory map of a file with a minimal binary file interface.
+
+    Reads copy only the requested window out of the map. Pages the reader
+    has moved past are released from the process's resident set (they stay
+    in the OS page cache), so scanning a multi-GB file does not grow peak
+    RSS with the file size. Empty files, which cannot be mapped, read as empty.
+    """
+
+    def __init__(self, path: str):
+        """
+        Map a file
+
+        Args:
+            path (str): File to map
+        """
+        self._file = open(path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        self._pos = 0
+        self._released = 0
+        if self._map is not None and hasattr(self._map, "madvise"):
+            self._map.madvise(mmap.MADV_SEQUENTIAL)
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to size bytes (everything if negative) from the current position"""
+        if self._map is None:
+            return b""
+        end = self.size if size < 0 else min(self._pos + size, self.size)
+        data = self._map[self._pos:end]
+        self._pos = end
+        self._release()
+        return data
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        """Move the read position; released pages are faulted back in from the page cache when read again"""
+        base = {os.SEEK_SET: 0, os.SEEK_CUR: self._pos, os.SEEK_END: self.size}[whence]
+        self._pos = min(max(base + offset, 0), self.size)
+        self._released = min(self._released, self._pos - self._pos % mmap.PAGESIZE)
+        return self._pos
+
+    def tell(self) -> int:
+        """Current read position"""
+        return self._pos
+
+    def _release(self):
+        """Drop whole pages behind the read position from the resident set, where the platform allows it"""
+        end = self._pos - self._pos % mmap.PAGESIZE
+        if end > self._released and hasattr(mmap, "MADV_DONTNEED"):
+            self._map.madvise(mmap.MADV_DONTNEED, self._released, end - self._released)
+            self._released = end
+
+    def close(self):
+        """Unmap and close the file"""
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def iter_text(stream: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE, encoding: str = "utf-8",
+              errors: str = "replace") -> Iterator[str]:
+    """
+    Decode a binary stream incrementally
+
+    Multi-byte characters split across reads are handled by the incremental
+    decoder, so only about chunk_size bytes are held at a time.
+
+    Args:
+        stream (BinaryIO): Readable binary stream, such as an uploaded file or an mmap
+        chunk_size (int): Bytes read per step
+        encoding (str): Text encoding
+        errors (str): Decoding error handler
+
+    Yields:
+        str: Consecutive pieces of the decoded text
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors)
+    while True:
+        data = stream.read(chunk_size)
+        if not data:
+            break
+        text = decoder.decode(data)
+        if text:
+            yield text
+
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_segments(pieces: Iterable[str], profile: str = "legacy") -> Iterator[str]:
+    """
+    Normalize decoded pieces without joining them
+
+    Each piece is cut after its last whitespace character and the trailing
+    partial word is carried into the next piece, so no word is split.
+    Joining the segments with single spaces gives the same text as
+    normalizing the whole input, except that runs of spaces left behind by
+    removed characters are collapsed at segment boundaries.
+
+    Args:
+        pieces (Iterable[str]): Raw text in consecutive pieces
+        profile (str): Normalization profile (see normalize.normalize_text)
+
+    Yields:
+        str: Non-empty normalized segments in document order
+    """
+    carry = ""
+    for piece in pieces:
+        piece = carry + piece
+        cut = len(piece)
+        while cut > 0 and not piece[cut - 1].isspace() and len(piece) - cut < MAX_CARRY:
+            cut -= 1
+        if cut == 0:
+            cut = len(piece) if len(piece) >= MAX_CARRY else 0
+
+        carry = piece[cut:]
+        segment = normalize_text(piece[:cut], profile)
+        if segment:
+            yield segment
+
+    segment = normalize_text(carry, profile)
+    if segment:
+        yield segment
+
+
+@dataclass
+class TextStats:
+    """Word, character and byte counts of a text, accumulated piece by piece"""
+    words: int = 0
+    chars: int = 0
+    bytes: int = 0
+    tokens: int = 0
+    _in_word: bool = field(default=False, repr=False)
+
+    def update(self, piece: str):
+        """
+        Add the counts of the next piece of text
+
+        A word split across two pieces is counted once.
+        """
+        if not piece:
+            return
+        self.chars += len(piece)
+        self.bytes += len(piece.encode("utf-8", "surrogatepass"))
+        self.tokens += estimate_tokens(piece)
+        self.words += len(piece.split())
+        if self._in_word and not piece[0].isspace():
+            self.words -= 1
+        self._in_word = not piece[-1].isspace()
+
+
+def scan(stream: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE, encoding: str = "utf-8") -> TextStats:
+    """
+    Count words, characters and bytes of a stream from its current position without loading it
+
+    Returns:
+        TextStats: Counts of the decoded text
+    """
+    stats = TextStats()
+    for piece in iter_text(stream, chunk_size, encoding):
+        stats.update(piece)
+    return stats
+
+
+def preview(stream: BinaryIO, chars: int = 500, encoding: str = "utf-8") -> str:
+    """
+    Decode the first chars characters of a stream from its current position
+
+    Returns:
+        str: Start of the text, with "..." appended if there is more
+    """
+    decoder = codecs.getincrementaldecoder(encoding)("replace")
+    # UTF-8 needs at most four bytes per character
+    text = decoder.decode(stream.read(chars * 4 + 1))
+    return text[:chars] + "..." if len(text) > chars else text
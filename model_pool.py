@@ -0,0 +1,119 @@
+import asyncio
+import hashlib
+import itertools
+import threading
+from typing import Awaitable, TypeVar
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+T = TypeVar("T")
+
+
+class ModelPool:
+    """
+    Process-wide, thread-safe pool of Gemini chat clients.
+
+    Clients are keyed on their full configuration and reused across
+    summarizer instances and sessions, so each one keeps its underlying
+    connection (a persistent gRPC channel, or a keep-alive HTTP session
+    with the REST transport) instead of paying connection and TLS setup
+    for every new user.
+
+    A client's async transport stays bound to the event loop it first ran
+    on, so synchronous callers run async work on the pool's own loop (see
+    run) rather than starting a new loop each time.
+    """
+
+    def __init__(self, size: int = 1):
+        """
+        Initialize the pool
+
+        Args:
+            size (int): Number of clients kept per configuration; requests are
+                spread over them round-robin
+        """
+        self.size = max(size, 1)
+        self._clients = {}
+        self._cursors = {}
+        self._lock = threading.Lock()
+        self._loop = None
+        self.created = 0
+        self.reused = 0
+
+    @staticmethod
+    def _key(config: dict) -> tuple:
+        """Build a hashable pool key, never holding the API key itself"""
+        items = []
+        for name, value in sorted(config.items()):
+            if name == "google_api_key":
+                value = hashlib.sha256(str(value).encode("utf-8")).hexdigest()
+            items.append((name, value))
+        return tuple(items)
+
+    def get(self, **config) -> ChatGoogleGenerativeAI:
+        """
+        Get a client for the given configuration, creating it on first use
+
+        Args:
+            **config: Keyword arguments for ChatGoogleGenerativeAI
+
+        Returns:
+            ChatGoogleGenerativeAI: Shared client
+        """
+        key = self._key(config)
+        with self._lock:
+            clients = self._clients.setdefault(key, [])
+            if len(clients) < self.size:
+                clients.append(ChatGoogleGenerativeAI(**config))
+                self._cursors[key] = itertools.cycle(range(self.size))
+                self.created += 1
+                return clients[-1]
+
+            self.reused += 1
+            return clients[next(self._cursors[key])]
+
+    def run(self, awaitable: Awaitable[T]) -> T:
+        """
+        Run a coroutine on the pool's event loop and wait for its result
+
+        The loop is started on a daemon thread on first use and kept for the
+        life of the process, so pooled clients always see the same loop.
+        Must not be called from that loop itself.
+
+        Args:
+            awaitable (Awaitable[T]): Coroutine to run
+
+        Returns:
+            T: Result of the coroutine
+        """
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="model-pool-loop", daemon=True).start()
+            loop = self._loop
+        return asyncio.run_coroutine_threadsafe(awaitable, loop).result()
+
+    def clear(self):
+        """Drop every pooled client"""
+        with self._lock:
+            self._clients.clear()
+            self._cursors.clear()
+
+    def stats(self) -> dict:
+        """
+        Get pool statistics
+
+        Returns:
+            dict: Number of configurations, clients and reuse counters
+        """
+        with self._lock:
+            return {
+                "configurations": len(self._clients),
+                "clients": sum(len(clients) for clients in self._clients.values()),
+                "created": self.created,
+                "reused": self.reused
+            }
+
+
+# Pool shared by every TextSummarizer in the process
+shared_pool = ModelPool(size=1)
+
@@ -0,0 +1,98 @@
+import re
+import unicodedata
+
+# Characters kept by the input cleaner besides word characters and whitespace
+_DISALLOWED = re.compile(r'[^\w\s\.\,\!\?\;\:\-\(\)\[\]\{\}\"\'\/]')
+
+# ASCII fast path: whitespace that str.split() and \s know about, mapped to a plain space
+_ASCII_WHITESPACE = bytes.maketrans(b"\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f", b" " * 9)
+_ASCII_DISALLOWED = bytes(
+    code for code in range(128)
+    if not chr(code).isspace() and _DISALLOWED.match(chr(code))
+)
+_SPACE_RUNS = re.compile(rb"  +")
+_ASCII_CONTROL = bytes(code for code in range(128) if (code < 32 or code == 127) and not chr(code).isspace())
+
+
+class _DisallowedTable(dict):
+    """str.translate table that classifies each code point once and remembers the answer"""
+
+    def __missing__(self, code: int):
+        char = chr(code)
+        value = None if _DISALLOWED.match(char) else code
+        self[code] = value
+        return value
+
+
+_UNICODE_TABLE = _DisallowedTable()
+
+# C0/C1 control characters that are not whitespace (whitespace is collapsed separately)
+_CONTROL = re.compile(r"[\x00-\x08\x0e-\x1b\x7f-\x84\x86-\x9f]+")
+
+# Available normalization profiles
+PROFILES = ("legacy", "unicode")
+
+
+def normalize_text(text: str, profile: str = "legacy") -> str:
+    """
+    Normalize input text according to a profile
+
+    Args:
+        text (str): Raw input text
+        profile (str): "legacy" keeps only word characters, whitespace and basic
+            punctuation; "unicode" applies NFKC and removes control characters
+            only, preserving symbols, dashes, quotes and non-Latin punctuation
+
+    Returns:
+        str: Cleaned text
+    """
+    if profile == "legacy":
+        return _normalize_legacy(text)
+    if profile == "unicode":
+        return _normalize_unicode(text)
+    raise ValueError(f"Unknown normalization profile: {profile!r} (expected one of {', '.join(PROFILES)})")
+
+
+def _normalize_legacy(text: str) -> str:
+    """
+    Collapse whitespace runs to single spaces, drop special characters and trim
+
+    Produces exactly the same output as the original two-regex cleaner
+    (re.sub(r'\\s+', ' ') followed by removal of everything outside \\w,
+    whitespace and basic punctuation, then strip()), but works with
+    translate tables instead of regex substitution over the whole text.
+
+    Args:
+        text (str): Raw input text
+
+    Returns:
+        str: Cleaned text
+    """
+    if text.isascii():
+        data = _SPACE_RUNS.sub(b" ", text.encode("ascii").translate(_ASCII_WHITESPACE))
+        return data.translate(None, _ASCII_DISALLOWED).decode("ascii").strip()
+
+    # Whitespace is collapsed before characters are removed, so removing a
+    # character between two spaces leaves both spaces in place
+    return " ".join(text.split()).translate(_UNICODE_TABLE).strip()
+
+
+def _normalize_unicode(text: str) -> str:
+    """
+    Apply NFKC, remove control characters, collapse whitespace runs and trim
+
+    Args:
+        text (str): Raw input text
+
+    Returns:
+        str: Cleaned text
+    """
+    if text.isascii():
+        data = text.encode("ascii").translate(_ASCII_WHITESPACE, _ASCII_CONTROL)
+        return _SPACE_RUNS.sub(b" ", data).decode("ascii").strip()
+
+    if not unicodedata.is_normalized("NFKC", text):
+        text = unicodedata.normalize("NFKC", text)
+
+    text = _CONTROL.sub("", text)
+    return " ".join(text.split())
@@ -0,0 +1,182 @@
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Classic token bucket: holds up to capacity units and refills continuously
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        """
+        Initialize a full bucket
+
+        Args:
+            capacity (float): Maximum number of units the bucket holds
+            refill_per_second (float): Units added back per second
+        """
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        """Add the units accrued since the last update"""
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount units are available (0 if they are available now)"""
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.refill_per_second
+
+    def take(self, amount: float):
+        """Remove amount units; callers check wait_time first"""
+        self.level -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """
+    Client-side limiter for requests-per-minute and tokens-per-minute budgets.
+
+    Callers block in acquire()/aacquire() until both budgets allow the
+    request, so throughput stays at the configured ceiling instead of
+    bursting into 429 errors. After a quota error, penalize() pauses all
+    callers for a cooldown period.
+    """
+
+    def __init__(self, requests_per_minute: int = 15, tokens_per_minute: int = 1_000_000, cooldown: float = 10.0):
+        """
+        Initialize the limiter
+
+        Args:
+            requests_per_minute (int): Request budget per minute
+            tokens_per_minute (int): Token budget per minute
+            cooldown (float): Default pause in seconds after a quota error
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.cooldown = cooldown
+        self._requests = TokenBucket(requests_per_minute, requests_per_minute / 60.0)
+        self._tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0)
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self.granted = 0
+        self.throttled = 0
+        self.penalties = 0
+
+    def _reserve(self, tokens: int) -> float:
+        """Take budget for one request if available; otherwise return the seconds to wait"""
+        with self._lock:
+            now = time.monotonic()
+            if self._paused_until > now:
+                return self._paused_until - now
+
+            self._requests.refill(now)
+            self._tokens.refill(now)
+            delay = max(self._requests.wait_time(1), self._tokens.wait_time(tokens))
+            if delay > 0:
+                return delay
+
+            self._requests.take(1)
+            self._tokens.take(tokens)
+            self.granted += 1
+            return 0.0
+
+    def try_acquire(self, tokens: int = 0) -> bool:
+        """
+        Take budget for one request without waiting
+
+        Args:
+            tokens (int): Estimated tokens the request will consume
+
+        Returns:
+            bool: True if the budget was taken
+        """
+        return self._reserve(tokens) == 0.0
+
+    def acquire(self, tokens: int = 0):
+        """
+        Block the calling thread until one request of the given size fits the budget
+
+        Args:
+            tokens (int): Estimated tokens the request will consume
+        """
+        delay = self._reserve(tokens)
+        if delay == 0.0:
+            return
+
+        with self._lock:
+            self._waiting += 1
+            self.throttled += 1
+        try:
+            while delay > 0:
+                time.sleep(delay)
+                delay = self._reserve(tokens)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    async def aacquire(self, tokens: int = 0):
+        """
+        Wait without blocking the event loop until one request of the given size fits the budget
+
+        Args:
+            tokens (int): Estimated tokens the request will consume
+        """
+        delay = self._reserve(tokens)
+        if delay == 0.0:
+            return
+
+        with self._lock:
+            self._waiting += 1
+            self.throttled += 1
+        try:
+            while delay > 0:
+                await asyncio.sleep(delay)
+                delay = self._reserve(tokens)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    def penalize(self, seconds: Optional[float] = None):
+        """
+        Pause all callers after the server reported quota exhaustion
+
+        Args:
+            seconds (Optional[float]): Pause length; defaults to the configured cooldown
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + (self.cooldown if seconds is None else seconds))
+            # The server says the budget is gone, so stop assuming otherwise
+            self._requests.level = 0
+            self.penalties += 1
+
+    def usage(self) -> dict:
+        """
+        Get the current budget usage
+
+        Returns:
+            dict: Remaining budgets, waiting callers and counters
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._requests.refill(now)
+            self._tokens.refill(now)
+            return {
+                "requests_per_minute": self.requests_per_minute,
+                "tokens_per_minute": self.tokens_per_minute,
+                "requests_available": int(self._requests.level),
+                "tokens_available": int(self._tokens.level),
+                "paused_for": max(self._paused_until - now, 0.0),
+                "waiting": self._waiting,
+                "granted": self.granted,
+                "throttled": self.throttled,
+                "penalties": self.penalties
+            }
@@ -0,0 +1,468 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from google.api_core import exceptions as google_exceptions
+
+T = TypeVar("T")
+
+# Errors worth another attempt: throttling, transient server failures and network trouble
+RETRYABLE_ERRORS = (
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.BadGateway,
+    google_exceptions.GatewayTimeout,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.Aborted,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+def server_retry_delay(error: Exception) -> Optional[float]:
+    """
+    Extract the retry delay the server asked for, if any
+
+    Looks at google.rpc.RetryInfo details (gRPC messages or REST JSON) and
+    at a Retry-After header on the HTTP response.
+
+    Args:
+        error (Exception): Error raised by the model call
+
+    Returns:
+        Optional[float]: Delay in seconds, or None if the server gave none
+    """
+    for detail in getattr(error, "details", None) or ():
+        retry_delay = getattr(detail, "retry_delay", None)
+        if retry_delay is not None:
+            return retry_delay.seconds + retry_delay.nanos / 1e9
+        if isinstance(detail, dict) and "retryDelay" in detail:
+            try:
+                return float(str(detail["retryDelay"]).rstrip("s"))
+            except ValueError:
+                pass
+
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers:
+        value = headers.get("Retry-After") or headers.get("retry-after")
+        if value is not None:
+            try:
+                return float(value)
+            except ValueError:
+                pass
+
+    return None
+
+
+class RetryPolicy:
+    """
+    Retry policy for model calls: exponential backoff with full jitter,
+    server-provided retry delays, and a per-minute retry budget.
+
+    Whether an error is retried depends on its type (see RETRYABLE_ERRORS),
+    never on its message. The budget is shared by everything using the
+    policy, so an outage cannot turn into a retry storm.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 20.0,
+                 max_server_delay: float = 60.0, budget_per_minute: int = 60,
+                 retryable: tuple = RETRYABLE_ERRORS):
+        """
+        Initialize the policy
+
+        Args:
+            max_attempts (int): Maximum attempts per call, including the first
+            base_delay (float): Backoff ceiling for the first retry, doubled on every attempt
+            max_delay (float): Upper bound for the backoff ceiling
+            max_server_delay (float): Upper bound for delays requested by the server
+            budget_per_minute (int): Maximum retries across all calls in any 60 second window
+            retryable (tuple): Exception types that may be retried
+        """
+        self.max_attempts = max(max_attempts, 1)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_server_delay = max_server_delay
+        self.budget_per_minute = budget_per_minute
+        self.retryable = retryable
+        self._recent_retries = deque()
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.server_delays = 0
+        self.fatal_errors = 0
+        self.exhausted = 0
+        self.budget_denied = 0
+
+    def is_retryable(self, error: Exception) -> bool:
+        """Check whether an error type is worth another attempt"""
+        return isinstance(error, self.retryable)
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Full-jitter exponential backoff
+
+        Args:
+            attempt (int): Number of attempts made so far (1 after the first failure)
+
+        Returns:
+            float: Random delay between 0 and the capped exponential ceiling
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def _take_budget(self) -> bool:
+        """Record a retry if the per-minute budget allows it"""
+        with self._lock:
+            now = time.monotonic()
+            while self._recent_retries and now - self._recent_retries[0] > 60:
+                self._recent_retries.popleft()
+            if len(self._recent_retries) >= self.budget_per_minute:
+                self.budget_denied += 1
+                return False
+            self._recent_retries.append(now)
+            self.retries += 1
+            return True
+
+    def next_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """
+        Decide whether to retry after a failed attempt
+
+        Args:
+            error (Exception): Error raised by the attempt
+            attempt (int): Number of attempts made so far
+
+        Returns:
+            Optional[float]: Seconds to wait before retrying, or None to give up
+        """
+        if not self.is_retryable(error):
+            with self._lock:
+                self.fatal_errors += 1
+            return None
+
+        if attempt >= self.max_attempts:
+            with self._lock:
+                self.exhausted += 1
+            return None
+
+        if not self._take_budget():
+            return None
+
+        delay = server_retry_delay(error)
+        if delay is not None:
+            with self._lock:
+                self.server_delays += 1
+            return min(delay, self.max_server_delay)
+
+        return self.backoff(attempt)
+
+    def record_attempt(self, first: bool):
+        """Count one attempt; first marks the start of a new call"""
+        with self._lock:
+            self.attempts += 1
+            if first:
+                self.calls += 1
+
+    def call(self, func: Callable[[], T], on_retry: Optional[Callable[[Exception, float], None]] = None) -> T:
+        """
+        Run func, retrying according to the policy
+
+        Args:
+            func (Callable): Zero-argument function performing one attempt
+            on_retry (Optional[Callable]): Called as on_retry(error, delay) before each retry
+
+        Returns:
+            The result of the first successful attempt
+        """
+        attempt = 0
+        while True:
+            self.record_attempt(attempt == 0)
+            attempt += 1
+            try:
+                return func()
+            except Exception as e:
+                delay = self.next_delay(e, attempt)
+                if delay is None:
+                    raise
+                if on_retry is not None:
+                    on_retry(e, delay)
+                time.sleep(delay)
+
+    async def acall(self, func: Callable[[], Awaitable[T]],
+                    on_retry: Optional[Callable[[Exception, float], None]] = None) -> T:
+        """
+        Async counterpart of call
+
+        Args:
+            func (Callable): Zero-argument coroutine function performing one attempt
+            on_retry (Optional[Callable]): Called as on_retry(error, delay) before each retry
+
+        Returns:
+            The result of the first successful attempt
+        """
+        attempt = 0
+        while True:
+            self.record_attempt(attempt == 0)
+            attempt += 1
+            try:
+                return await func()
+            except Exception as e:
+                delay = self.next_delay(e, attempt)
+                if delay is None:
+                    raise
+                if on_retry is not None:
+                    on_retry(e, delay)
+                await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        """
+        Get retry counters for monitoring
+
+        Returns:
+            dict: Calls, attempts, retries and reasons for giving up
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "attempts": self.attempts,
+                "retries": self.retries,
+                "server_delays": self.server_delays,
+                "fatal_errors": self.fatal_errors,
+                "exhausted": self.exhausted,
+                "budget_denied": self.budget_denied,
+                "retries_last_minute": len(self._recent_retries)
+            }
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the model while the circuit breaker is open"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Circuit breaker is open; upstream calls resume in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for the model backend.
+
+    While closed, outcomes are tracked over a sliding time window; once
+    enough calls have been seen and the failure rate reaches the
+    threshold, the breaker opens and every call fails immediately with
+    CircuitOpenError. After open_seconds it half-opens and lets a few
+    probe calls through: a successful probe closes it, a failed one
+    opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_rate: float = 0.5, min_calls: int = 10, window: float = 60.0,
+                 open_seconds: float = 30.0, half_open_probes: int = 1,
+                 failures: tuple = RETRYABLE_ERRORS):
+        """
+        Initialize the breaker
+
+        Args:
+            failure_rate (float): Failure ratio in the window that opens the breaker
+            min_calls (int): Minimum calls in the window before the ratio is considered
+            window (float): Length of the sliding window in seconds
+            open_seconds (float): Time the breaker stays open before probing
+            half_open_probes (int): Concurrent probe calls allowed while half-open
+            failures (tuple): Exception types that count as upstream failures;
+                other errors (bad requests, invalid keys) do not affect the breaker
+        """
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.failures = failures
+        self._state = self.CLOSED
+        self._outcomes = deque()
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.opened = 0
+
+    @property
+    def state(self) -> str:
+        """Current state: closed, open or half_open"""
+        with self._lock:
+            return self._state
+
+    def allow(self):
+        """
+        Reserve permission for one call
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with all probes in flight
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+
+            now = time.monotonic()
+            if self._state == self.OPEN:
+                remaining = self._opened_at + self.open_seconds - now
+                if remaining > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(remaining)
+                self._state = self.HALF_OPEN
+                self._probes = 0
+
+            if self._probes >= self.half_open_probes:
+                self.rejected += 1
+                raise CircuitOpenError(0.0)
+            self._probes += 1
+
+    def record(self, error: Optional[Exception] = None):
+        """
+        Record the outcome of a call that allow() let through; calls without
+        an outcome are handed back with release() instead
+
+        Args:
+            error (Optional[Exception]): The error raised by the call, or None on success
+        """
+        failed = error is not None and isinstance(error, self.failures)
+        with self._lock:
+            now = time.monotonic()
+
+            if self._state == self.HALF_OPEN:
+                self._probes = max(self._probes - 1, 0)
+                if failed:
+                    self._open(now)
+                else:
+                    self._state = self.CLOSED
+                    self._outcomes.clear()
+                return
+
+            self._outcomes.append((now, failed))
+            while self._outcomes and now - self._outcomes[0][0] > self.window:
+                self._outcomes.popleft()
+
+            if failed and self._state == self.CLOSED and len(self._outcomes) >= self.min_calls:
+                failures = sum(1 for _, outcome in self._outcomes if outcome)
+                if failures / len(self._outcomes) >= self.failure_rate:
+                    self._open(now)
+
+    def release(self):
+        """
+        Give back the permission of a call that ended without an outcome
+
+        Used when a call allow() let through is cancelled or interrupted:
+        nothing is recorded, but a half-open probe slot is freed so the
+        next call can probe instead.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._probes = max(self._probes - 1, 0)
+
+    def _open(self, now: float):
+        """Switch to open; caller holds the lock"""
+        self._state = self.OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+        self.opened += 1
+
+    def stats(self) -> dict:
+        """
+        Get breaker state and counters for monitoring
+
+        Returns:
+            dict: State, calls in the window, times opened and calls rejected
+        """
+        with self._lock:
+            return {
+                "state": self._state,
+                "window_calls": len(self._outcomes),
+                "window_failures": sum(1 for _, failed in self._outcomes if failed),
+                "opened": self.opened,
+                "rejected": self.rejected
+            }
+
+
+class HedgingPolicy:
+    """
+    Settings and statistics for hedged model requests.
+
+    When a call has not completed within the hedge delay (a percentile of
+    recently observed latencies), a duplicate request is issued and
+    whichever finishes first is used.
+    """
+
+    def __init__(self, percentile: float = 95.0, initial_delay: float = 2.0, min_delay: float = 0.25,
+                 max_delay: float = 15.0, history: int = 200, min_samples: int = 20):
+        """
+        Initialize the policy
+
+        Args:
+            percentile (float): Latency percentile used as the hedge delay
+            initial_delay (float): Hedge delay used until min_samples latencies are known
+            min_delay (float): Lower bound for the hedge delay
+            max_delay (float): Upper bound for the hedge delay
+            history (int): Number of recent latencies kept
+            min_samples (int): Latencies needed before the percentile is trusted
+        """
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self._latencies = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.fired = 0
+        self.hedge_wins = 0
+        self.skipped = 0
+
+    def record_latency(self, seconds: float):
+        """Remember the latency of a successful request"""
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def delay(self) -> float:
+        """
+        Current hedge delay
+
+        Returns:
+            float: Seconds to wait for the first request before hedging
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return self.initial_delay
+            ordered = sorted(self._latencies)
+        index = min(int(len(ordered) * self.percentile / 100), len(ordered) - 1)
+        return min(max(ordered[index], self.min_delay), self.max_delay)
+
+    def record_call(self, fired: bool = False, hedge_won: bool = False, skipped: bool = False):
+        """Count the outcome of one hedged call"""
+        with self._lock:
+            self.calls += 1
+            self.fired += fired
+            self.hedge_wins += hedge_won
+            self.skipped += skipped
+
+    def stats(self) -> dict:
+        """
+        Get hedging counters for monitoring
+
+        Returns:
+            dict: Calls, hedges fired and won, hedges skipped for lack of rate budget, current delay
+        """
+        delay = self.delay()
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "fired": self.fired,
+                "hedge_wins": self.hedge_wins,
+                "skipped": self.skipped,
+                "delay": delay
+            }
@@ -0,0 +1,203 @@
+import logging
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from backends import GeminiBackend, ModelBackend
+from model_pool import ModelPool
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Route:
+    """
+    A model configuration and the requests it serves.
+
+    A request matches when every limit that is set holds for it. Prompt
+    tokens are the local estimate for the whole input (see tokens.py).
+    max_output_tokens caps the per-call output budget the summarizer
+    derives from the requested length.
+    """
+    name: str
+    backend: ModelBackend
+    min_prompt_tokens: Optional[int] = None
+    max_prompt_tokens: Optional[int] = None
+    styles: Optional[Tuple[str, ...]] = None
+    min_words: Optional[int] = None
+    max_words: Optional[int] = None
+    max_output_tokens: Optional[int] = None
+
+    def matches(self, prompt_tokens: int, style: str, max_words: int) -> bool:
+        """Whether a request with these properties belongs on this route"""
+        return (
+            (self.min_prompt_tokens is None or prompt_tokens >= self.min_prompt_tokens)
+            and (self.max_prompt_tokens is None or prompt_tokens <= self.max_prompt_tokens)
+            and (self.styles is None or style in self.styles)
+            and (self.min_words is None or max_words >= self.min_words)
+            and (self.max_words is None or max_words <= self.max_words)
+        )
+
+    def describe(self) -> dict:
+        """Route configuration as plain data"""
+        return {
+            "name": self.name,
+            "model_name": self.backend.model_name,
+            "provider": self.backend.provider,
+            "max_tokens": getattr(self.backend, "max_tokens", None),
+            "min_prompt_tokens": self.min_prompt_tokens,
+            "max_prompt_tokens": self.max_prompt_tokens,
+            "styles": list(self.styles) if self.styles is not None else None,
+            "min_words": self.min_words,
+            "max_words": self.max_words,
+            "max_output_tokens": self.max_output_tokens
+        }
+
+
+class ModelRouter:
+    """
+    Picks the model configuration for each request.
+
+    Routes are tried in order and the first match wins; the last route is
+    the default for requests nothing else matches. A pinned route, or a
+    route named for a single call, overrides the rules. Every decision is
+    logged on the "router" logger.
+    """
+
+    def __init__(self, routes: Sequence[Route], pinned: Optional[str] = None):
+        """
+        Initialize the router
+
+        Args:
+            routes (Sequence[Route]): Routes in priority order; the last one is the default
+            pinned (Optional[str]): Route every request to this route, for example while
+                another model is having trouble
+
+        Raises:
+            ValueError: If there are no routes, names repeat or pinned is unknown
+        """
+        if not routes:
+            raise ValueError("A router needs at least one route")
+        names = [route.name for route in routes]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Route names must be unique: {', '.join(names)}")
+        self.routes = list(routes)
+        self.pinned = pinned
+        if pinned is not None:
+            self.get(pinned)
+        self._lock = threading.Lock()
+        self._counts = {name: 0 for name in names}
+
+    @property
+    def default(self) -> Route:
+        """Route for requests no other route matches"""
+        return self.routes[-1]
+
+    def get(self, name: str) -> Route:
+        """
+        Look up a route by name
+
+        Raises:
+            ValueError: If there is no such route
+        """
+        for route in self.routes:
+            if route.name == name:
+                return route
+        raise ValueError(f"Unknown route: {name!r} (expected one of {', '.join(r.name for r in self.routes)})")
+
+    def select(self, prompt_tokens: int, style: str, max_words: int, override: Optional[str] = None) -> Route:
+        """
+        Choose the route for a request
+
+        Args:
+            prompt_tokens (int): Estimated prompt tokens of the whole input
+            style (str): Summary style
+            max_words (int): Maximum words in the summary
+            override (Optional[str]): Route name chosen by the caller; takes precedence
+                over the pinned route and the rules
+
+        Returns:
+            Route: Selected route
+
+        Raises:
+            ValueError: If override names an unknown route
+        """
+        if override is not None:
+            route, reason = self.get(override), "requested"
+        elif self.pinned is not None:
+            route, reason = self.get(self.pinned), "pinned"
+        else:
+            route = next((r for r in self.routes[:-1] if r.matches(prompt_tokens, style, max_words)), self.default)
+            reason = "default" if route is self.default else "matched"
+
+        with self._lock:
+            self._counts[route.name] += 1
+        logger.info(
+            "Routing %s request (~%d prompt tokens, %d words) to %s (%s, %s)",
+            style, prompt_tokens, max_words, route.name, route.backend.model_name, reason
+        )
+        return route
+
+    def signature(self, override: Optional[str] = None) -> str:
+        """
+        Identify the models a request may be routed to, for cache keys
+
+        Returns:
+            str: The single model when the choice is fixed, else the whole route table
+        """
+        fixed = override or self.pinned
+        if fixed is not None:
+            return self.get(fixed).backend.model_name
+        if len(self.routes) == 1:
+            return self.default.backend.model_name
+        return "router:" + ",".join(f"{route.name}={route.backend.model_name}" for route in self.routes)
+
+    def describe(self) -> List[dict]:
+        """
+        Get the route table
+
+        Returns:
+            List[dict]: Route configurations in priority order
+        """
+        return [route.describe() for route in self.routes]
+
+    def stats(self) -> dict:
+        """
+        Get routing counters
+
+        Returns:
+            dict: Requests routed to each route
+        """
+        with self._lock:
+            return dict(self._counts)
+
+
+def gemini_router(api_key: str, timeout: int = 30, model_pool: Optional[ModelPool] = None,
+                  pinned: Optional[str] = None) -> ModelRouter:
+    """
+    Tiered Gemini routes
+
+    Short brief and bullet-point requests go to Flash-8B with a small
+    output cap, detailed summaries of long inputs go to Pro, and
+    everything else stays on Flash. Each call's output budget comes from
+    its requested length; the clients share one default.
+
+    Args:
+        api_key (str): Google API key
+        timeout (int): Timeout in seconds for a single call
+        model_pool (Optional[ModelPool]): Pool the clients are taken from
+        pinned (Optional[str]): Route every request to "fast", "heavy" or "standard"
+
+    Returns:
+        ModelRouter: Router over the three tiers
+    """
+    def backend(model_name: str) -> GeminiBackend:
+        return GeminiBackend(api_key, model_name=model_name, temperature=0.3, max_tokens=1024,
+                             timeout=timeout, model_pool=model_pool)
+
+    return ModelRouter([
+        Route("fast", backend("gemini-1.5-flash-8b"), max_prompt_tokens=8000,
+              styles=("brief", "bullet points"), max_words=200, max_output_tokens=512),
+        Route("heavy", backend("gemini-1.5-pro"), min_prompt_tokens=32000, styles=("detailed",)),
+        Route("standard", backend("gemini-1.5-flash")),
+    ], pinned=pinned)
@@ -0,0 +1,499 @@
+"""
+Headless HTTP API for the summarizer.
+
+Usage:
+    python server.py [--host 0.0.0.0] [--port 8080] [--workers 8] [--queue-size 64]
+
+Endpoints:
+    POST /summarize          {"text": "...", "style": "brief", "max_words": 150, "language": "english"}
+    POST /summarize/batch    {"texts": ["...", "..."], ...same options}
+    POST /summarize/stream   same body as /summarize; newline-delimited JSON events
+    GET  /healthz            200 while serving, 503 while draining or when Gemini is unavailable
+                             (unless EXTRACTIVE_FALLBACK is set, which reports "degraded")
+    GET  /metrics            Prometheus text format
+
+At most --workers summaries run at once and at most --queue-size more wait
+for a worker; requests beyond that are rejected with 429 and Retry-After.
+On SIGINT/SIGTERM the server stops accepting work and lets admitted
+requests finish for up to --drain-timeout seconds.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from typing import Optional
+
+from aiohttp import web
+from dotenv import load_dotenv
+from google.api_core.exceptions import DeadlineExceeded, PermissionDenied, TooManyRequests, Unauthenticated
+
+from resilience import CircuitOpenError
+from settings import summarizer_from_env
+from summarizer import ENGINES, BatchItem, TextSummarizer
+
+STYLES = ("brief", "detailed", "bullet points")
+
+# Languages are free-form names ("english", "português", "simplified chinese"),
+# but they go into the prompt, so only short names made of letters are accepted
+MAX_LANGUAGE_CHARS = 40
+
+
+class AdmissionQueue:
+    """
+    Bounded admission for summarization work.
+
+    Admitted requests hold a place until they finish; a worker slot is
+    taken only while the model is being driven. Admission fails instead of
+    queueing without bound, so overload is pushed back to the caller.
+    """
+
+    def __init__(self, workers: int = 8, queue_size: int = 64):
+        """
+        Initialize the queue
+
+        Args:
+            workers (int): Summaries processed at once
+            queue_size (int): Admitted requests allowed to wait for a worker
+        """
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.admitted = 0
+        self.active = 0
+        self.rejected = 0
+        self._slots = asyncio.Semaphore(workers)
+
+    def admit(self, count: int = 1) -> bool:
+        """
+        Reserve places for count items
+
+        Returns:
+            bool: True if admitted; the caller must release the same count later
+        """
+        if self.admitted + count > self.capacity:
+            self.rejected += 1
+            return False
+        self.admitted += count
+        return True
+
+    def release(self, count: int = 1):
+        """Give back places reserved by admit"""
+        self.admitted -= count
+
+    @asynccontextmanager
+    async def worker(self):
+        """Hold a worker slot for the duration of the block"""
+        async with self._slots:
+            self.active += 1
+            try:
+                yield
+            finally:
+                self.active -= 1
+
+    @property
+    def waiting(self) -> int:
+        """Admitted items not yet holding a worker slot"""
+        return self.admitted - self.active
+
+
+class Metrics:
+    """Request counters and latency totals, rendered in Prometheus text format"""
+
+    def __init__(self):
+        self.requests = defaultdict(int)
+        self.latency_sum = defaultdict(float)
+        self.latency_count = defaultdict(int)
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.extractive = 0
+        self.started = time.time()
+
+    def observe(self, endpoint: str, status: int, seconds: float):
+        """Record one finished request"""
+        self.requests[(endpoint, status)] += 1
+        self.latency_sum[endpoint] += seconds
+        self.latency_count[endpoint] += 1
+
+    def render(self, summarizer: TextSummarizer, queue: AdmissionQueue) -> str:
+        """
+        Render all metrics, including the summarizer's resilience and cache statistics
+
+        Returns:
+            str: Metrics in Prometheus text exposition format
+        """
+        lines = [
+            "# TYPE summarizer_requests_total counter",
+            *(f'summarizer_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}'
+              for (endpoint, status), count in sorted(self.requests.items())),
+            "# TYPE summarizer_request_seconds summary",
+            *(f'summarizer_request_seconds_sum{{endpoint="{endpoint}"}} {total:.6f}'
+              for endpoint, total in sorted(self.latency_sum.items())),
+            *(f'summarizer_request_seconds_count{{endpoint="{endpoint}"}} {count}'
+              for endpoint, count in sorted(self.latency_count.items())),
+            "# TYPE summarizer_queue_admitted gauge",
+            f"summarizer_queue_admitted {queue.admitted}",
+            "# TYPE summarizer_queue_waiting gauge",
+            f"summarizer_queue_waiting {queue.waiting}",
+            "# TYPE summarizer_queue_active gauge",
+            f"summarizer_queue_active {queue.active}",
+            "# TYPE summarizer_queue_capacity gauge",
+            f"summarizer_queue_capacity {queue.capacity}",
+            "# TYPE summarizer_queue_rejected_total counter",
+            f"summarizer_queue_rejected_total {queue.rejected}",
+            "# TYPE summarizer_summaries_cache_hits_total counter",
+            f"summarizer_summaries_cache_hits_total {self.cache_hits}",
+            "# TYPE summarizer_summaries_coalesced_total counter",
+            f"summarizer_summaries_coalesced_total {self.coalesced}",
+            "# TYPE summarizer_summaries_extractive_total counter",
+            f"summarizer_summaries_extractive_total {self.extractive}",
+            "# TYPE summarizer_uptime_seconds gauge",
+            f"summarizer_uptime_seconds {time.time() - self.started:.3f}",
+        ]
+
+        breaker = summarizer.circuit_breaker.stats()
+        lines += [
+            "# TYPE summarizer_circuit_open gauge",
+            f"summarizer_circuit_open {int(breaker['state'] != 'closed')}",
+            "# TYPE summarizer_circuit_opened_total counter",
+            f"summarizer_circuit_opened_total {breaker['opened']}",
+            "# TYPE summarizer_circuit_rejected_total counter",
+            f"summarizer_circuit_rejected_total {breaker['rejected']}",
+        ]
+
+        sections = {"retry": summarizer.retry_policy.stats(), "single_flight": summarizer.single_flight.stats()}
+        if summarizer.cache is not None:
+            sections["cache"] = summarizer.cache.stats()
+        if summarizer.rate_limiter is not None:
+            sections["rate_limiter"] = summarizer.rate_limiter.usage()
+        if summarizer.hedging is not None:
+            sections["hedging"] = summarizer.hedging.stats()
+
+        for section, stats in sections.items():
+            for name, value in stats.items():
+                if isinstance(value, bool):
+                    value = int(value)
+                if isinstance(value, (int, float)):
+                    lines.append(f"summarizer_{section}_{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+def error_status(error: Exception) -> int:
+    """
+    Map a summarizer failure to an HTTP status
+
+    TextSummarizer raises user-facing exceptions chained to the original
+    error, so the status is chosen from the original type.
+    """
+    cause = error.__context__ or error
+    if isinstance(cause, ValueError):
+        return 400
+    if isinstance(cause, CircuitOpenError):
+        return 503
+    if isinstance(cause, TooManyRequests):
+        return 429
+    if isinstance(cause, (Unauthenticated, PermissionDenied)):
+        return 502
+    if isinstance(cause, (DeadlineExceeded, TimeoutError)):
+        return 504
+    return 500
+
+
+def json_error(status: int, message: str, retry_after: Optional[float] = None) -> web.Response:
+    """Build an error response with an optional Retry-After header"""
+    headers = {"Retry-After": str(max(round(retry_after), 1))} if retry_after is not None else None
+    return web.json_response({"error": message}, status=status, headers=headers)
+
+
+def error_response(error: Exception) -> web.Response:
+    """Build the error response for a failed summarization"""
+    cause = error.__context__ or error
+    retry_after = cause.retry_after if isinstance(cause, CircuitOpenError) else None
+    return json_error(error_status(error), str(error), retry_after)
+
+
+def parse_options(body: dict) -> dict:
+    """
+    Validate the summary options of a request body
+
+    Returns:
+        dict: Keyword arguments for TextSummarizer.asummarize_text
+
+    Raises:
+        ValueError: If an option is missing or invalid
+    """
+    options = {
+        "style": str(body.get("style", "brief")).lower(),
+        "max_words": body.get("max_words", 150),
+        "language": str(body.get("language", "english")).lower(),
+    }
+    if options["style"] not in STYLES:
+        raise ValueError(f"style must be one of {', '.join(STYLES)}")
+    if not isinstance(options["max_words"], int) or not 10 <= options["max_words"] <= 2000:
+        raise ValueError("max_words must be an integer between 10 and 2000")
+    language = options["language"]
+    if len(language) > MAX_LANGUAGE_CHARS or not language.replace(" ", "").replace("-", "").isalpha():
+        raise ValueError(f"language must be a language name of at most {MAX_LANGUAGE_CHARS} letters")
+    if body.get("chunked") is not None:
+        options["chunked"] = bool(body["chunked"])
+    if body.get("normalization") is not None:
+        options["normalization"] = body["normalization"]
+    if body.get("engine") is not None:
+        if body["engine"] not in ENGINES:
+            raise ValueError(f"engine must be one of {', '.join(ENGINES)}")
+        options["engine"] = body["engine"]
+    if body.get("route") is not None:
+        options["route"] = str(body["route"])
+    return options
+
+
+async def read_body(request: web.Request) -> dict:
+    """Parse a JSON object body, raising ValueError if it is not one"""
+    try:
+        body = await request.json()
+    except json.JSONDecodeError:
+        raise ValueError("Request body must be valid JSON")
+    if not isinstance(body, dict):
+        raise ValueError("Request body must be a JSON object")
+    return body
+
+
+def result_payload(result) -> dict:
+    """JSON form of a SummaryResult"""
+    payload = asdict(result)
+    payload["latency"] = result.latency
+    return payload
+
+
+class SummarizerServer:
+    """aiohttp handlers wrapping a TextSummarizer"""
+
+    def __init__(self, summarizer: TextSummarizer, workers: int = 8, queue_size: int = 64,
+                 max_batch: int = 100):
+        """
+        Initialize the server
+
+        Args:
+            summarizer (TextSummarizer): Summarizer serving all requests
+            workers (int): Summaries processed at once
+            queue_size (int): Admitted requests allowed to wait for a worker
+            max_batch (int): Maximum number of texts in one batch request
+        """
+        self.summarizer = summarizer
+        self.queue = AdmissionQueue(workers, queue_size)
+        self.max_batch = max_batch
+        self.metrics = Metrics()
+        self.draining = False
+
+    def create_app(self, client_max_size: int = 32 * 1024 * 1024) -> web.Application:
+        """Build the aiohttp application"""
+        app = web.Application(client_max_size=client_max_size, middlewares=[self._observe])
+        app.add_routes([
+            web.post("/summarize", self.summarize),
+            web.post("/summarize/batch", self.summarize_batch),
+            web.post("/summarize/stream", self.summarize_stream),
+            web.get("/healthz", self.healthz),
+            web.get("/metrics", self.render_metrics),
+        ])
+        app.on_shutdown.append(self._on_shutdown)
+        return app
+
+    @web.middleware
+    async def _observe(self, request: web.Request, handler):
+        """Count every request by route and status"""
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await handler(request)
+            status = response.status
+            return response
+        except web.HTTPException as e:
+            status = e.status
+            raise
+        finally:
+            route = request.match_info.route.resource
+            endpoint = route.canonical if route is not None else "unmatched"
+            self.metrics.observe(endpoint, status, time.perf_counter() - start)
+
+    async def _on_shutdown(self, app: web.Application):
+        """Stop admitting work; aiohttp then waits for admitted requests to finish"""
+        self.draining = True
+
+    def _reject(self) -> Optional[web.Response]:
+        """Response for work that cannot be admitted, or None if it can"""
+        if self.draining:
+            return json_error(503, "Server is shutting down")
+        return None
+
+    def _record(self, result):
+        """Update summary-level counters from a SummaryResult"""
+        self.metrics.cache_hits += result.cache_hit
+        self.metrics.coalesced += result.coalesced
+        self.metrics.extractive += result.engine == "extractive"
+
+    async def summarize(self, request: web.Request) -> web.Response:
+        """Summarize one text"""
+        rejection = self._reject()
+        if rejection is not None:
+            return rejection
+        try:
+            body = await read_body(request)
+            text = body.get("text")
+            if not isinstance(text, str):
+                raise ValueError("text must be a string")
+            options = parse_options(body)
+        except ValueError as e:
+            return json_error(400, str(e))
+
+        if not self.queue.admit():
+            return json_error(429, "Too many requests queued", 1)
+        try:
+            async with self.queue.worker():
+                result = await self.summarizer.asummarize_text(text, return_result=True, **options)
+        except Exception as e:
+            return error_response(e)
+        finally:
+            self.queue.release()
+
+        self._record(result)
+        return web.json_response(result_payload(result))
+
+    async def summarize_batch(self, request: web.Request) -> web.Response:
+        """Summarize a list of texts, reporting failures per item"""
+        rejection = self._reject()
+        if rejection is not None:
+            return rejection
+        try:
+            body = await read_body(request)
+            texts = body.get("texts")
+            if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                raise ValueError("texts must be a list of strings")
+            # A batch larger than the queue could never be admitted
+            limit = min(self.max_batch, self.queue.capacity)
+            if not texts or len(texts) > limit:
+                raise ValueError(f"texts must contain between 1 and {limit} items")
+            options = parse_options(body)
+        except ValueError as e:
+            return json_error(400, str(e))
+
+        # The whole batch is admitted or rejected, so it never half-runs under load
+        if not self.queue.admit(len(texts)):
+            return json_error(429, "Too many requests queued", 1)
+
+        async def run(index: int, text: str) -> BatchItem:
+            try:
+                async with self.queue.worker():
+                    result = await self.summarizer.asummarize_text(text, return_result=True, **options)
+                self._record(result)
+                return BatchItem(index, summary=result.summary)
+            except Exception as e:
+                return BatchItem(index, error=str(e))
+            finally:
+                self.queue.release()
+
+        start = time.perf_counter()
+        items = await asyncio.gather(*(run(i, text) for i, text in enumerate(texts)))
+        return web.json_response({
+            "items": [asdict(item) for item in items],
+            "succeeded": sum(item.ok for item in items),
+            "failed": sum(not item.ok for item in items),
+            "elapsed": time.perf_counter() - start
+        })
+
+    async def summarize_stream(self, request: web.Request) -> web.StreamResponse:
+        """Stream a summary as newline-delimited JSON: delta events, then a result or error event"""
+        rejection = self._reject()
+        if rejection is not None:
+            return rejection
+        try:
+            body = await read_body(request)
+            text = body.get("text")
+            if not isinstance(text, str):
+                raise ValueError("text must be a string")
+            options = parse_options(body)
+        except ValueError as e:
+            return json_error(400, str(e))
+
+        if not self.queue.admit():
+            return json_error(429, "Too many requests queued", 1)
+
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        results = []
+        try:
+            async with self.queue.worker():
+                stream = self.summarizer.astream_summary(text, on_result=results.append, **options)
+                try:
+                    async for piece in stream:
+                        if not response.prepared:
+                            await response.prepare(request)
+                        await response.write(json.dumps({"delta": piece}).encode("utf-8") + b"\n")
+                finally:
+                    await stream.aclose()
+        except ConnectionResetError:
+            # The client went away; closing the stream above cancelled the model call
+            return response
+        except Exception as e:
+            # Before the first piece the failure can still be a proper status code
+            if not response.prepared:
+                return error_response(e)
+            await response.write(json.dumps({"error": str(e)}).encode("utf-8") + b"\n")
+        else:
+            if not response.prepared:
+                await response.prepare(request)
+            self._record(results[0])
+            await response.write(json.dumps({"result": result_payload(results[0])}).encode("utf-8") + b"\n")
+        finally:
+            self.queue.release()
+
+        await response.write_eof()
+        return response
+
+    async def healthz(self, request: web.Request) -> web.Response:
+        """Report whether the server accepts work"""
+        state = self.summarizer.circuit_breaker.state
+        # With the extractive fallback an open circuit degrades answers instead of failing them
+        degraded = state == "open"
+        healthy = not self.draining and (not degraded or self.summarizer.extractive_fallback)
+        return web.json_response({
+            "status": ("degraded" if degraded else "ok") if healthy else "unavailable",
+            "draining": self.draining,
+            "circuit": state,
+            "queued": self.queue.admitted
+        }, status=200 if healthy else 503)
+
+    async def render_metrics(self, request: web.Request) -> web.Response:
+        """Expose metrics for scraping"""
+        return web.Response(
+            text=self.metrics.render(self.summarizer, self.queue),
+            content_type="text/plain",
+            charset="utf-8"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="0.0.0.0", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    parser.add_argument("--workers", type=int, default=8, help="Summaries processed at once")
+    parser.add_argument("--queue-size", type=int, default=64, help="Requests allowed to wait for a worker")
+    parser.add_argument("--max-batch", type=int, default=100, help="Maximum texts in one batch request")
+    parser.add_argument("--drain-timeout", type=float, default=30, help="Seconds admitted requests get to finish on shutdown")
+    parser.add_argument("--log-level", default="warning", help="Logging level; info shows routing decisions")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    load_dotenv()
+    server = SummarizerServer(
+        summarizer_from_env(max_concurrency=args.workers),
+        workers=args.workers,
+        queue_size=args.queue_size,
+        max_batch=args.max_batch
+    )
+    web.run_app(server.create_app(), host=args.host, port=args.port, shutdown_timeout=args.drain_timeout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import os
+from typing import Optional
+
+from backends import FakeBackend, ModelBackend, parse_latency
+from cache import SummaryCache
+from ratelimit import RateLimiter
+from router import ModelRouter, gemini_router
+from summarizer import TextSummarizer
+
+
+def rate_limiter_from_env() -> Optional[RateLimiter]:
+    """
+    Build the Gemini rate limiter from GEMINI_REQUESTS_PER_MINUTE and GEMINI_TOKENS_PER_MINUTE
+
+    Returns:
+        Optional[RateLimiter]: Limiter for the configured budgets, or None if neither is set
+    """
+    rpm = os.getenv("GEMINI_REQUESTS_PER_MINUTE")
+    tpm = os.getenv("GEMINI_TOKENS_PER_MINUTE")
+    if not rpm and not tpm:
+        return None
+    return RateLimiter(
+        requests_per_minute=int(rpm or 15),
+        tokens_per_minute=int(tpm or 1_000_000)
+    )
+
+
+def backend_from_env() -> Optional[ModelBackend]:
+    """
+    Build the model backend selected by SUMMARIZER_BACKEND
+
+    "fake" selects the offline FakeBackend, configured by FAKE_LATENCY (for
+    example "lognormal:0.8:0.5"), FAKE_ERROR_RATE, FAKE_STREAM_ERROR_RATE,
+    FAKE_MAX_CONCURRENCY and FAKE_SEED. Anything else means Gemini.
+
+    Returns:
+        Optional[ModelBackend]: The fake backend, or None to use Gemini
+    """
+    if os.getenv("SUMMARIZER_BACKEND", "gemini").lower() != "fake":
+        return None
+    max_concurrency = os.getenv("FAKE_MAX_CONCURRENCY")
+    seed = os.getenv("FAKE_SEED")
+    return FakeBackend(
+        latency=parse_latency(os.getenv("FAKE_LATENCY", "lognormal:0.8:0.5")),
+        error_rate=float(os.getenv("FAKE_ERROR_RATE", "0")),
+        stream_error_rate=float(os.getenv("FAKE_STREAM_ERROR_RATE", "0")),
+        max_concurrency=int(max_concurrency) if max_concurrency else None,
+        seed=int(seed) if seed else None
+    )
+
+
+def router_from_env(api_key: str, timeout: int = 30) -> Optional[ModelRouter]:
+    """
+    Build the Gemini router selected by MODEL_ROUTING
+
+    "tiered" routes requests over Flash-8B, Flash and Pro by size, style
+    and length (see router.gemini_router). SUMMARIZER_ROUTE pins every
+    request to one of those routes.
+
+    Returns:
+        Optional[ModelRouter]: The tiered router, or None for a single model
+    """
+    if os.getenv("MODEL_ROUTING", "").lower() != "tiered":
+        return None
+    return gemini_router(api_key, timeout=timeout, pinned=os.getenv("SUMMARIZER_ROUTE") or None)
+
+
+def summarizer_from_env(**options) -> TextSummarizer:
+    """
+    Build a TextSummarizer configured from environment variables
+
+    Reads GOOGLE_API_KEY, SUMMARY_CACHE_PATH and the Gemini budgets, the
+    same settings the Streamlit app uses, SUMMARIZER_BACKEND (see
+    backend_from_env), MODEL_ROUTING and SUMMARIZER_ROUTE (see router_from_env),
+    EXTRACTIVE_TOKENS / EXTRACTIVE_METHOD, SUMMARIZER_ENGINE and EXTRACTIVE_FALLBACK.
+
+    Args:
+        **options: Further keyword arguments for TextSummarizer; they take
+            precedence over the environment
+
+    Returns:
+        TextSummarizer: Configured summarizer
+
+    Raises:
+        Exception: If GOOGLE_API_KEY is not set and Gemini is the default engine
+    """
+    if "backend" not in options:
+        options["backend"] = backend_from_env()
+    if "engine" not in options and os.getenv("SUMMARIZER_ENGINE"):
+        options["engine"] = os.getenv("SUMMARIZER_ENGINE").lower()
+    api_key = os.getenv("GOOGLE_API_KEY", "")
+    # The extractive engine runs locally, so it starts without a key
+    if not api_key and options["backend"] is None and options.get("engine") != "extractive":
+        raise Exception("Google API Key not found. Please set the GOOGLE_API_KEY environment variable.")
+
+    if "cache" not in options:
+        options["cache"] = SummaryCache(path=os.getenv("SUMMARY_CACHE_PATH") or None)
+    if "rate_limiter" not in options:
+        options["rate_limiter"] = rate_limiter_from_env()
+    if "router" not in options and options["backend"] is None and api_key:
+        options["router"] = router_from_env(api_key, options.get("timeout", 30))
+    if "extractive_tokens" not in options and os.getenv("EXTRACTIVE_TOKENS"):
+        options["extractive_tokens"] = int(os.getenv("EXTRACTIVE_TOKENS"))
+    if "extractive_method" not in options and os.getenv("EXTRACTIVE_METHOD"):
+        options["extractive_method"] = os.getenv("EXTRACTIVE_METHOD").lower()
+    if "extractive_fallback" not in options:
+        options["extractive_fallback"] = os.getenv("EXTRACTIVE_FALLBACK", "").lower() in ("1", "true", "yes")
+    return TextSummarizer(api_key, **options)
@@ -1,58 +1,307 @@
+import asyncio
 import os
-from langchain_google_genai import ChatGoogleGenerativeAI
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Union
+from google.api_core.exceptions import DeadlineExceeded, PermissionDenied, TooManyRequests, Unauthenticated
 from langchain.schema import HumanMessage, SystemMessage
 
 import re
+from backends import BackendNotConfigured, GeminiBackend, ModelBackend, OutputTruncated, UnconfiguredBackend
+from cache import FlightAbandoned, SingleFlight, SummaryCache
+from extractive import extract, extract_segments, summarize, summarize_segments
+from ingest import iter_segments, iter_text
+from model_pool import ModelPool, shared_pool
+from normalize import normalize_text
+from tokens import CHARS_PER_TOKEN, MAX_OUTPUT_TOKENS, estimate_tokens, output_token_budget
+from ratelimit import RateLimiter
+from router import ModelRouter, Route
+from resilience import RETRYABLE_ERRORS, CircuitBreaker, CircuitOpenError, HedgingPolicy, RetryPolicy, server_retry_delay
+
+SYSTEM_PROMPT = "You are a professional text summarizer. Provide accurate, concise, and well-structured summaries."
+
+UNWANTED_PREFIXES = ["SUMMARY:", "Summary:", "Here is the summary:", "Here's the summary:"]
+
+# "abstractive" asks the model; "extractive" selects sentences locally (see extractive.py)
+ENGINES = ("abstractive", "extractive")
+
+# Failures the extractive fallback answers: the model is unreachable, throttled or failing fast
+FALLBACK_ERRORS = RETRYABLE_ERRORS + (CircuitOpenError,)
+
+# Option combinations whose prompt overhead is remembered; callers choose the
+# options, so the memo is cleared rather than allowed to grow without bound
+OVERHEAD_CACHE_SIZE = 256
+
+
+class StageTimer:
+    """
+    Measures the stages of one summarization call
+    
+    The optional callback is invoked as on_stage(name, None) when a stage
+    starts and on_stage(name, seconds) when it finishes.
+    """
+    
+    def __init__(self, on_stage: Optional[Callable[[str, Optional[float]], None]] = None):
+        self.on_stage = on_stage
+        self.timings: Dict[str, float] = {}
+    
+    @contextmanager
+    def stage(self, name: str):
+        if self.on_stage is not None:
+            self.on_stage(name, None)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed
+            if self.on_stage is not None:
+                self.on_stage(name, elapsed)
+
+
+class _PrefixStripper:
+    """
+    Incrementally removes leading whitespace and unwanted prefixes from streamed model output
+    
+    Output is held back until enough text has arrived to rule out a prefix,
+    after which pieces pass straight through.
+    """
+    
+    holdback = max(len(prefix) for prefix in UNWANTED_PREFIXES)
+    
+    def __init__(self):
+        self.buffer = ""
+        self.started = False
+        self.emitted = False
+    
+    def _strip(self, text: str) -> str:
+        text = text.lstrip()
+        for prefix in UNWANTED_PREFIXES:
+            if text.startswith(prefix):
+                text = text[len(prefix):].lstrip()
+        return text
+    
+    def feed(self, piece: str) -> str:
+        """Consume one streamed piece and return the text that is safe to emit"""
+        if self.started:
+            self.emitted = self.emitted or bool(piece.strip())
+            return piece
+        
+        self.buffer += piece
+        if len(self.buffer.lstrip()) < self.holdback:
+            return ""
+        
+        self.started = True
+        return self.feed(self._strip(self.buffer))
+    
+    def finish(self) -> str:
+        """Flush any held-back text once the stream has ended"""
+        if self.started:
+            return ""
+        self.started = True
+        return self.feed(self._strip(self.buffer).rstrip())
+
+
+@dataclass
+class BatchItem:
+    """Outcome of summarizing one text in a batch"""
+    index: int
+    summary: Optional[str] = None
+    error: Optional[str] = None
+    
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BatchResult:
+    """Per-item outcomes of a batch run, in input order, with aggregate throughput"""
+    items: List[BatchItem] = field(default_factory=list)
+    elapsed: float = 0.0
+    
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for item in self.items if item.ok)
+    
+    @property
+    def failed(self) -> int:
+        return len(self.items) - self.succeeded
+    
+    @property
+    def throughput(self) -> float:
+        """Items processed per second"""
+        return len(self.items) / self.elapsed if self.elapsed > 0 else 0.0
+
+
+@dataclass(slots=True)
+class SummaryResult:
+    """
+    A generated summary together with the metadata of the call that produced it
+    
+    Token counts are local estimates (see tokens.estimate_tokens); timings
+    are seconds per pipeline stage. truncated marks a summary the model cut
+    off at its output budget; such summaries are not cached. fallback marks
+    an extractive summary served because the model call failed, rather
+    than one that was asked for.
+    """
+    summary: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    timings: Dict[str, float] = field(default_factory=dict)
+    model_name: str = ""
+    route: Optional[str] = None
+    engine: str = "abstractive"
+    cache_hit: bool = False
+    coalesced: bool = False
+    retries: int = 0
+    chunked: bool = False
+    truncated: bool = False
+    fallback: bool = False
+    summary_words: int = 0
+    summary_chars: int = 0
+    
+    @property
+    def latency(self) -> float:
+        """Total seconds spent across all stages"""
+        return sum(self.timings.values())
+
+
+@dataclass
+class _PreparedRequest:
+    """Result of the local steps that run before any model call"""
+    cleaned_text: str
+    prompt: Optional[str] = None
+    prompt_tokens: int = 0
+    cache_key: Optional[str] = None
+    cached: Optional[str] = None
+    chunked: bool = False
+    chunks: int = 0
+    coalesced: bool = False
+    retries: int = 0
+    truncated: bool = False
+    fallback: bool = False
+    engine: str = "abstractive"
+    route: Optional[Route] = None
+
+
 class TextSummarizer:
     """
     AI-powered text summarization using Google Gemini 1.5 Flash via LangChain
     """
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: Optional[str] = None, chunk_tokens: int = 6000, max_concurrency: int = 4, timeout: int = 30,
+                 cache: Optional[SummaryCache] = None, rate_limiter: Optional[RateLimiter] = None,
+                 model_pool: Optional[ModelPool] = None, normalization: str = "legacy",
+                 max_input_tokens: Optional[int] = None, retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None, hedging: Optional[HedgingPolicy] = None,
+                 single_flight: Optional[SingleFlight] = None, backend: Optional[ModelBackend] = None,
+                 extractive_tokens: Optional[int] = None, extractive_method: str = "tfidf",
+                 engine: str = "abstractive", extractive_fallback: bool = False,
+                 router: Optional[ModelRouter] = None):
         """
         Initialize the summarizer with Google API key
         
         Args:
-            api_key (str): Google API key for Gemini access
+            api_key (Optional[str]): Google API key for Gemini access; required unless
+                a backend is given or the default engine is "extractive"
+            chunk_tokens (int): Token budget for a single prompt; longer inputs
+                are summarized chunk by chunk (map-reduce)
+            max_concurrency (int): Maximum number of chunk requests in flight
+            timeout (int): Timeout in seconds for a single model call
+            cache (Optional[SummaryCache]): Cache for generated summaries
+            rate_limiter (Optional[RateLimiter]): Client-side RPM/TPM limiter applied to every model call
+            model_pool (Optional[ModelPool]): Pool the Gemini client is taken from;
+                defaults to the process-wide shared pool
+            normalization (str): Default preprocessing profile, "legacy" or "unicode"
+                (see normalize.normalize_text)
+            max_input_tokens (Optional[int]): Reject documents estimated above this many
+                tokens before any request is sent
+            retry_policy (Optional[RetryPolicy]): Backoff and retry budget for model calls;
+                defaults to RetryPolicy()
+            circuit_breaker (Optional[CircuitBreaker]): Breaker that fails calls fast while
+                the backend is unhealthy; defaults to CircuitBreaker()
+            hedging (Optional[HedgingPolicy]): Enables hedged requests for non-streaming
+                calls; disabled by default
+            single_flight (Optional[SingleFlight]): Coalesces identical concurrent requests
+                into one model call; defaults to SingleFlight(), share one instance to
+                coalesce across summarizers
+            backend (Optional[ModelBackend]): Model the summarizer talks to, for example
+                backends.FakeBackend for offline load tests; defaults to Gemini
+            extractive_tokens (Optional[int]): Before the model call, cut longer texts down
+                to their most salient sentences within this many tokens (see extractive.py);
+                disabled by default
+            extractive_method (str): Sentence scoring for extraction, "tfidf" or "textrank"
+            engine (str): Default engine, "abstractive" (the model) or "extractive" (local
+                sentence selection without any model call); calls can override it
+            extractive_fallback (bool): Answer with an extractive summary instead of raising
+                when the model is unreachable, throttled or the circuit breaker is open
+            router (Optional[ModelRouter]): Picks the model for each request by input size,
+                style and length (see router.py); defaults to a single route to the backend
         """
         self.api_key = api_key
-        self.model = self._initialize_model()
+        self.context_tokens = 1_000_000
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.chunk_tokens = chunk_tokens
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.model_pool = model_pool or shared_pool
+        self.normalization = normalization
+        self.max_input_tokens = max_input_tokens
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.hedging = hedging
+        self.single_flight = single_flight or SingleFlight()
+        self.extractive_tokens = extractive_tokens
+        self.extractive_method = extractive_method
+        self.engine = engine
+        self._engine(engine)
+        self.extractive_fallback = extractive_fallback
+        self._hedge_executor = None
+        self._hedge_lock = threading.Lock()
+        self._overhead_cache = {}
+        self.backend = backend or (router.default.backend if router is not None else self._initialize_backend())
+        self.router = router or ModelRouter([Route("default", self.backend)])
+        self.model_name = self.backend.model_name
+        self.temperature = self.backend.temperature
     
-    def _initialize_model(self):
-        """Initialize the Gemini model through LangChain"""
+    def _initialize_backend(self) -> ModelBackend:
+        """Create the Gemini backend through LangChain, reusing a pooled client when one exists"""
+        if not self.api_key:
+            message = "A Google API key is required for abstractive summaries"
+            if self.engine == "extractive":
+                # Local summaries need no model; only an abstractive call fails
+                return UnconfiguredBackend(message)
+            raise Exception(f"Failed to initialize Gemini model: {message}")
         try:
-            model = ChatGoogleGenerativeAI(
-                model="gemini-1.5-flash",
-                google_api_key=self.api_key,
+            return GeminiBackend(
+                self.api_key,
+                model_name="gemini-1.5-flash",
                 temperature=0.3,
                 max_tokens=1024,
-                timeout=30,
-                max_retries=2
+                timeout=self.timeout,
+                model_pool=self.model_pool
             )
-            return model
         except Exception as e:
             raise Exception(f"Failed to initialize Gemini model: {str(e)}")
     
-    def _preprocess_text(self, text: str) -> str:
+    def _preprocess_text(self, text: str, normalization: Optional[str] = None) -> str:
         """
         Clean and preprocess the input text
         
         Args:
             text (str): Raw input text
+            normalization (Optional[str]): Preprocessing profile; defaults to the summarizer's
             
         Returns:
             str: Cleaned text
         """
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove special characters that might cause issues
-        text = re.sub(r'[^\w\s\.\,\!\?\;\:\-\(\)\[\]\{\}\"\'\/]', '', text)
-        
-        # Trim whitespace
-        text = text.strip()
-        
-        return text
+        return normalize_text(text, normalization or self.normalization)
     
     def _create_prompt(self, text: str, style: str, max_words: int, language: str) -> str:
         """
@@ -95,7 +344,770 @@ SUMMARY:
         
         return prompt
     
-    def summarize_text(self, text: str, style: str = "brief", max_words: int = 150, language: str = "english") -> str:
+    def _create_chunk_prompt(self, chunk: str, index: int, total: int, max_words: int, language: str) -> str:
+        """
+        Create the prompt used to summarize one section of a long document (map step)
+        
+        Args:
+            chunk (str): Section text
+            index (int): 1-based position of the section
+            total (int): Total number of sections
+            max_words (int): Maximum words for the partial summary
+            language (str): Output language
+            
+        Returns:
+            str: Formatted prompt
+        """
+        return f"""
+You are an expert text summarizer. The text below is section {index} of {total} of a longer document.
+
+INSTRUCTIONS:
+- Summarize the key facts, main ideas and important details of this section
+- Maximum length: approximately {max_words} words
+- Output language: {language}
+- Do not add information not present in the section
+
+SECTION TEXT:
+{chunk}
+
+SUMMARY:
+"""
+    
+    def _create_reduce_prompt(self, partials: List[str], style: str, max_words: int, language: str) -> str:
+        """
+        Create the prompt that merges partial summaries into the final summary (reduce step)
+        
+        Args:
+            partials (List[str]): Partial summaries in document order
+            style (str): Summary style (brief, detailed, bullet points)
+            max_words (int): Maximum words in summary
+            language (str): Output language
+            
+        Returns:
+            str: Formatted prompt
+        """
+        sections = "\n\n".join(f"[Part {i}]\n{partial}" for i, partial in enumerate(partials, 1))
+        return self._create_prompt(
+            "The following are summaries of consecutive parts of one document. "
+            "Combine them into a single coherent summary of the whole document.\n\n" + sections,
+            style,
+            max_words,
+            language
+        )
+    
+    def _estimate_tokens(self, text: str) -> int:
+        """Cheap local estimate of the number of tokens in text"""
+        return estimate_tokens(text)
+    
+    def _prompt_tokens(self, text: str, style: str, max_words: int, language: str) -> int:
+        """
+        Estimate the tokens of the full request for text, including the system message
+        
+        The instruction overhead only depends on the options, so it is
+        measured once per combination and cached (up to OVERHEAD_CACHE_SIZE
+        combinations).
+        """
+        key = (style, max_words, language)
+        overhead = self._overhead_cache.get(key)
+        if overhead is None:
+            overhead = self._estimate_tokens(SYSTEM_PROMPT + self._create_prompt("", style, max_words, language))
+            if len(self._overhead_cache) >= OVERHEAD_CACHE_SIZE:
+                self._overhead_cache.clear()
+            self._overhead_cache[key] = overhead
+        return overhead + self._estimate_tokens(text)
+    
+    def _split_into_chunks(self, text: str, max_tokens: int) -> List[str]:
+        """
+        Split text into chunks of at most max_tokens (estimated), on sentence boundaries where possible
+        
+        Sentences are measured with the same estimate the planner uses, so
+        non-ASCII text is packed as tightly as count_tokens predicts.
+        
+        Args:
+            text (str): Cleaned text
+            max_tokens (int): Token budget per chunk
+            
+        Returns:
+            List[str]: Chunks in document order
+        """
+        max_tokens = max(max_tokens, 1)
+        chunks = []
+        current = []
+        current_tokens = 0
+        
+        for sentence in re.split(r'(?<=[\.\!\?])\s+', text):
+            sentence_tokens = self._estimate_tokens(sentence)
+            # Sentences longer than a whole chunk are split on word boundaries
+            while sentence_tokens > max_tokens:
+                limit = self._prefix_within(sentence, max_tokens)
+                cut = sentence.rfind(' ', 0, limit)
+                if cut <= 0:
+                    cut = limit
+                if current:
+                    chunks.append(' '.join(current))
+                    current, current_tokens = [], 0
+                chunks.append(sentence[:cut].strip())
+                sentence = sentence[cut:].strip()
+                sentence_tokens = self._estimate_tokens(sentence)
+            
+            # Each sentence also pays for the space that joins it to the next
+            if current and current_tokens + sentence_tokens + 1 > max_tokens:
+                chunks.append(' '.join(current))
+                current, current_tokens = [], 0
+            
+            if sentence:
+                current.append(sentence)
+                current_tokens += sentence_tokens + 1
+        
+        if current:
+            chunks.append(' '.join(current))
+        
+        return chunks
+    
+    def _prefix_within(self, text: str, max_tokens: int) -> int:
+        """Length of the longest prefix of text estimated at no more than max_tokens (at least 1)"""
+        low, high = 1, min(len(text), max_tokens * CHARS_PER_TOKEN)
+        # The estimate only grows with the prefix, so binary search for the last one that fits
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self._estimate_tokens(text[:middle]) <= max_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        return low
+    
+    def _build_messages(self, prompt: str) -> list:
+        """Wrap a user prompt with the summarizer system message"""
+        return [SystemMessage(content=SYSTEM_PROMPT), HumanMessage(content=prompt)]
+    
+    def _clean_summary(self, content: str) -> str:
+        """
+        Strip whitespace and unwanted prefixes from model output
+        
+        Args:
+            content (str): Raw model output
+            
+        Returns:
+            str: Cleaned summary
+        """
+        summary = content.strip()
+        
+        # Remove any unwanted prefixes that the model might add
+        for prefix in UNWANTED_PREFIXES:
+            if summary.startswith(prefix):
+                summary = summary[len(prefix):].strip()
+        
+        if not summary:
+            raise Exception("Generated summary is empty")
+        
+        return summary
+    
+    def _complete(self, prompt: str, request: Optional[_PreparedRequest] = None,
+                  output_tokens: Optional[int] = None) -> str:
+        """
+        Send a single prompt to the model and return the cleaned response text
+        
+        Args:
+            prompt (str): User prompt
+            request (Optional[_PreparedRequest]): Call the prompt belongs to, for retry accounting
+            output_tokens (Optional[int]): Output budget for the response (see _output_budget)
+            
+        Returns:
+            str: Model output with unwanted prefixes removed
+        """
+        return self._clean_summary(self._invoke(prompt, request, output_tokens))
+    
+    def _invoke(self, prompt: str, request: Optional[_PreparedRequest] = None,
+                output_tokens: Optional[int] = None) -> str:
+        """
+        Send a single prompt to the model, respecting the rate limiter and retry policy
+        
+        A response cut off at its output budget is requested once more with
+        twice the budget; if that is cut off too, it is returned and the
+        request is marked truncated.
+        
+        Args:
+            prompt (str): User prompt
+            request (Optional[_PreparedRequest]): Call the prompt belongs to, for retry accounting
+            output_tokens (Optional[int]): Output budget for the response (see _output_budget)
+            
+        Returns:
+            str: Raw model output
+        """
+        messages = self._build_messages(prompt)
+        tokens = self._estimate_tokens(SYSTEM_PROMPT + prompt)
+        backend = self._backend(request)
+        
+        def attempt(budget: Optional[int]) -> tuple:
+            self.circuit_breaker.allow()
+            truncated = False
+            try:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire(tokens)
+                content = self._call_model(messages, tokens, backend, budget)
+            except OutputTruncated as e:
+                # The call itself succeeded
+                content, truncated = e.content, True
+            except Exception as e:
+                self._record_failure(e)
+                raise
+            except BaseException:
+                # Interrupted without an outcome; free the breaker's probe slot
+                self.circuit_breaker.release()
+                raise
+            self.circuit_breaker.record()
+            return content, truncated
+        
+        on_retry = self._retry_counter(request)
+        content, truncated = self.retry_policy.call(lambda: attempt(output_tokens), on_retry=on_retry)
+        wider = self._wider_budget(request, output_tokens) if truncated else None
+        if wider is not None:
+            content, truncated = self.retry_policy.call(lambda: attempt(wider), on_retry=on_retry)
+        if truncated and request is not None:
+            request.truncated = True
+        return content
+    
+    def _call_model(self, messages: list, tokens: int, backend: ModelBackend,
+                    output_tokens: Optional[int] = None) -> str:
+        """
+        Invoke the model once, hedging with a duplicate request if hedging is enabled
+        
+        Args:
+            messages (list): Chat messages
+            tokens (int): Estimated request tokens, charged to the rate limiter for a hedge
+            backend (ModelBackend): Model the request was routed to
+            output_tokens (Optional[int]): Output budget for the response
+            
+        Returns:
+            str: Raw model output
+        """
+        if self.hedging is None:
+            return backend.invoke(messages, max_output_tokens=output_tokens)
+        
+        def timed_call() -> str:
+            start = time.perf_counter()
+            content = backend.invoke(messages, max_output_tokens=output_tokens)
+            self.hedging.record_latency(time.perf_counter() - start)
+            return content
+        
+        with self._hedge_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(max_workers=max(self.max_concurrency * 2, 4))
+        
+        primary = self._hedge_executor.submit(timed_call)
+        done, _ = wait([primary], timeout=self.hedging.delay())
+        if done:
+            self.hedging.record_call()
+            return primary.result()
+        
+        # Only hedge when the rate limiter has budget to spare right now
+        if self.rate_limiter is not None and not self.rate_limiter.try_acquire(tokens):
+            self.hedging.record_call(skipped=True)
+            return primary.result()
+        
+        hedge = self._hedge_executor.submit(timed_call)
+        pending = {primary, hedge}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                # A failed request only counts once the other one has failed too
+                if future.exception() is None or not pending:
+                    # Threads cannot be interrupted; a losing request finishes in the background
+                    for loser in pending:
+                        loser.cancel()
+                    self.hedging.record_call(fired=True, hedge_won=future is hedge and future.exception() is None)
+                    return future.result()
+    
+    async def _acall_model(self, messages: list, tokens: int, backend: ModelBackend,
+                           output_tokens: Optional[int] = None) -> str:
+        """Async counterpart of _call_model; the losing request is cancelled"""
+        if self.hedging is None:
+            return await backend.ainvoke(messages, max_output_tokens=output_tokens)
+        
+        async def timed_call() -> str:
+            start = time.perf_counter()
+            content = await backend.ainvoke(messages, max_output_tokens=output_tokens)
+            self.hedging.record_latency(time.perf_counter() - start)
+            return content
+        
+        primary = asyncio.ensure_future(timed_call())
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.hedging.delay())
+            if done:
+                self.hedging.record_call()
+                return primary.result()
+            
+            # Only hedge when the rate limiter has budget to spare right now
+            if self.rate_limiter is not None and not self.rate_limiter.try_acquire(tokens):
+                self.hedging.record_call(skipped=True)
+                return await primary
+            
+            hedge = asyncio.ensure_future(timed_call())
+            tasks.append(hedge)
+            pending = {primary, hedge}
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    # A failed request only counts once the other one has failed too
+                    if task.exception() is None or not pending:
+                        self.hedging.record_call(fired=True, hedge_won=task is hedge and task.exception() is None)
+                        return task.result()
+        finally:
+            # Also stops the requests of a caller cancelled while waiting on them
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    async def _acomplete(self, prompt: str, request: Optional[_PreparedRequest] = None,
+                         output_tokens: Optional[int] = None) -> str:
+        """Async counterpart of _complete using the model's native async invocation"""
+        return self._clean_summary(await self._ainvoke(prompt, request, output_tokens))
+    
+    async def _ainvoke(self, prompt: str, request: Optional[_PreparedRequest] = None,
+                       output_tokens: Optional[int] = None) -> str:
+        """Async counterpart of _invoke"""
+        messages = self._build_messages(prompt)
+        tokens = self._estimate_tokens(SYSTEM_PROMPT + prompt)
+        backend = self._backend(request)
+        
+        async def attempt(budget: Optional[int]) -> tuple:
+            self.circuit_breaker.allow()
+            truncated = False
+            try:
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.aacquire(tokens)
+                content = await self._acall_model(messages, tokens, backend, budget)
+            except OutputTruncated as e:
+                # The call itself succeeded
+                content, truncated = e.content, True
+            except Exception as e:
+                self._record_failure(e)
+                raise
+            except BaseException:
+                # Cancelled without an outcome; free the breaker's probe slot
+                self.circuit_breaker.release()
+                raise
+            self.circuit_breaker.record()
+            return content, truncated
+        
+        on_retry = self._retry_counter(request)
+        content, truncated = await self.retry_policy.acall(lambda: attempt(output_tokens), on_retry=on_retry)
+        wider = self._wider_budget(request, output_tokens) if truncated else None
+        if wider is not None:
+            content, truncated = await self.retry_policy.acall(lambda: attempt(wider), on_retry=on_retry)
+        if truncated and request is not None:
+            request.truncated = True
+        return content
+    
+    def _stream_prompt(self, prompt: str, request: Optional[_PreparedRequest] = None,
+                       output_tokens: Optional[int] = None) -> Iterator[str]:
+        """
+        Send a single prompt to the model and yield the response as it is generated
+        
+        Failures are retried only while nothing has been yielded yet. A
+        response cut off at its output budget ends the stream normally and
+        marks the request truncated.
+        
+        Args:
+            prompt (str): User prompt
+            request (Optional[_PreparedRequest]): Call the prompt belongs to, for retry accounting
+            output_tokens (Optional[int]): Output budget for the response (see _output_budget)
+            
+        Yields:
+            str: Pieces of the cleaned model output
+        """
+        messages = self._build_messages(prompt)
+        tokens = self._estimate_tokens(SYSTEM_PROMPT + prompt)
+        backend = self._backend(request)
+        on_retry = self._retry_counter(request)
+        attempt = 0
+        
+        while True:
+            self.retry_policy.record_attempt(attempt == 0)
+            attempt += 1
+            self.circuit_breaker.allow()
+            stripper = _PrefixStripper()
+            yielded = False
+            try:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire(tokens)
+                for content in backend.stream(messages, max_output_tokens=output_tokens):
+                    piece = stripper.feed(content)
+                    if piece:
+                        yielded = True
+                        yield piece
+            except OutputTruncated:
+                # What was streamed stands, but it is flagged and not cached
+                self.circuit_breaker.record()
+                if request is not None:
+                    request.truncated = True
+                break
+            except Exception as e:
+                self._record_failure(e)
+                delay = None if yielded else self.retry_policy.next_delay(e, attempt)
+                if delay is None:
+                    raise
+                if on_retry is not None:
+                    on_retry(e, delay)
+                time.sleep(delay)
+            except GeneratorExit:
+                # The consumer stopped reading; the upstream was healthy up to here
+                self.circuit_breaker.record()
+                raise
+            except BaseException:
+                # Cancelled or interrupted without an outcome; free the breaker's probe slot
+                self.circuit_breaker.release()
+                raise
+            else:
+                self.circuit_breaker.record()
+                break
+        
+        tail = stripper.finish()
+        if tail:
+            yield tail
+        
+        if not stripper.emitted:
+            raise Exception("Generated summary is empty")
+    
+    async def _astream_prompt(self, prompt: str, request: Optional[_PreparedRequest] = None,
+                              output_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """Async counterpart of _stream_prompt"""
+        messages = self._build_messages(prompt)
+        tokens = self._estimate_tokens(SYSTEM_PROMPT + prompt)
+        backend = self._backend(request)
+        on_retry = self._retry_counter(request)
+        attempt = 0
+        
+        while True:
+            self.retry_policy.record_attempt(attempt == 0)
+            attempt += 1
+            self.circuit_breaker.allow()
+            stripper = _PrefixStripper()
+            yielded = False
+            try:
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.aacquire(tokens)
+                async for content in backend.astream(messages, max_output_tokens=output_tokens):
+                    piece = stripper.feed(content)
+                    if piece:
+                        yielded = True
+                        yield piece
+            except OutputTruncated:
+                # What was streamed stands, but it is flagged and not cached
+                self.circuit_breaker.record()
+                if request is not None:
+                    request.truncated = True
+                break
+            except Exception as e:
+                self._record_failure(e)
+                delay = None if yielded else self.retry_policy.next_delay(e, attempt)
+                if delay is None:
+                    raise
+                if on_retry is not None:
+                    on_retry(e, delay)
+                await asyncio.sleep(delay)
+            except GeneratorExit:
+                # The consumer stopped reading; the upstream was healthy up to here
+                self.circuit_breaker.record()
+                raise
+            except BaseException:
+                # Cancelled or interrupted without an outcome; free the breaker's probe slot
+                self.circuit_breaker.release()
+                raise
+            else:
+                self.circuit_breaker.record()
+                break
+        
+        tail = stripper.finish()
+        if tail:
+            yield tail
+        
+        if not stripper.emitted:
+            raise Exception("Generated summary is empty")
+    
+    def _output_budget(self, request: Optional[_PreparedRequest], max_words: int, language: str) -> int:
+        """
+        Output tokens for one response of about max_words words
+        
+        Derived from the requested length and language (see
+        tokens.output_token_budget) and capped by the request's route.
+        """
+        budget = output_token_budget(max_words, language)
+        route = request.route if request is not None else None
+        if route is not None and route.max_output_tokens is not None:
+            budget = min(budget, route.max_output_tokens)
+        return budget
+    
+    def _wider_budget(self, request: Optional[_PreparedRequest], budget: Optional[int]) -> Optional[int]:
+        """Twice an output budget that cut a response off, within the route's cap; None if it cannot grow"""
+        if budget is None:
+            return None
+        route = request.route if request is not None else None
+        ceiling = MAX_OUTPUT_TOKENS
+        if route is not None and route.max_output_tokens is not None:
+            ceiling = min(ceiling, route.max_output_tokens)
+        wider = min(budget * 2, ceiling)
+        return wider if wider > budget else None
+    
+    def _backend(self, request: Optional[_PreparedRequest]) -> ModelBackend:
+        """Backend of the route a request was given, or the default backend"""
+        if request is not None and request.route is not None:
+            return request.route.backend
+        return self.backend
+    
+    def _record_failure(self, error: Exception):
+        """Report a failed model call to the circuit breaker and, for quota errors, the rate limiter"""
+        self.circuit_breaker.record(error)
+        if isinstance(error, TooManyRequests) and self.rate_limiter is not None:
+            self.rate_limiter.penalize(server_retry_delay(error))
+    
+    def _retry_counter(self, request: Optional[_PreparedRequest]) -> Optional[Callable[[Exception, float], None]]:
+        """Build an on_retry callback that counts retries on the request"""
+        if request is None:
+            return None
+        
+        def on_retry(error: Exception, delay: float):
+            request.retries += 1
+        
+        return on_retry
+    
+    def _map_reduce_prompt(self, request: _PreparedRequest, style: str, max_words: int, language: str,
+                           chunks: Optional[Iterable[str]] = None) -> str:
+        """
+        Summarize token-budgeted chunks of a long text concurrently and merge the
+        partial summaries until they fit in a single prompt
+        
+        Args:
+            request (_PreparedRequest): Prepared request holding the cleaned text
+            style (str): Summary style
+            max_words (int): Maximum words in the final summary
+            language (str): Output language
+            chunks (Optional[Iterable[str]]): Chunks to summarize instead of splitting the
+                cleaned text; they are consumed lazily and request.chunks must hold their number
+            
+        Returns:
+            str: Prompt for the final reduce step
+        """
+        chunk_budget, partial_words = self._chunk_budget(max_words, language)
+        partial_tokens = self._output_budget(request, partial_words, language)
+        if chunks is None:
+            chunks = self._split_into_chunks(request.cleaned_text, chunk_budget)
+            request.chunks = len(chunks)
+        
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            # At most max_concurrency chunks are pending, so lazy chunk sources stay lazy
+            partials = list(self._bounded_map(
+                executor,
+                lambda item: self._complete(
+                    self._create_chunk_prompt(item[1], item[0], request.chunks, partial_words, language),
+                    request,
+                    partial_tokens
+                ),
+                enumerate(chunks, 1)
+            ))
+            
+            # Merge groups of partial summaries until they fit in one prompt
+            while True:
+                prompt = self._create_reduce_prompt(partials, style, max_words, language)
+                if len(partials) == 1 or self._estimate_tokens(prompt) <= self.chunk_tokens:
+                    return prompt
+                
+                groups = self._group_partials(partials, chunk_budget)
+                partials = list(executor.map(
+                    lambda group: self._complete(
+                        self._create_reduce_prompt(group, "detailed", partial_words, language),
+                        request,
+                        partial_tokens
+                    ),
+                    groups
+                ))
+    
+    async def _amap_reduce_prompt(self, request: _PreparedRequest, style: str, max_words: int, language: str) -> str:
+        """Async counterpart of _map_reduce_prompt; at most max_concurrency chunk requests run at once"""
+        chunk_budget, partial_words = self._chunk_budget(max_words, language)
+        partial_tokens = self._output_budget(request, partial_words, language)
+        chunks = self._split_into_chunks(request.cleaned_text, chunk_budget)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def complete(prompt: str) -> str:
+            async with semaphore:
+                return await self._acomplete(prompt, request, partial_tokens)
+        
+        partials = await asyncio.gather(*(
+            complete(self._create_chunk_prompt(chunk, i, len(chunks), partial_words, language))
+            for i, chunk in enumerate(chunks, 1)
+        ))
+        
+        # Merge groups of partial summaries until they fit in one prompt
+        while True:
+            prompt = self._create_reduce_prompt(partials, style, max_words, language)
+            if len(partials) == 1 or self._estimate_tokens(prompt) <= self.chunk_tokens:
+                return prompt
+            
+            groups = self._group_partials(partials, chunk_budget)
+            partials = await asyncio.gather(*(
+                complete(self._create_reduce_prompt(group, "detailed", partial_words, language))
+                for group in groups
+            ))
+    
+    def _bounded_map(self, executor: ThreadPoolExecutor, func: Callable, items: Iterable) -> Iterator:
+        """Like executor.map, but pulls items only as results are consumed, max_concurrency at a time"""
+        pending = deque()
+        for item in items:
+            if len(pending) >= self.max_concurrency:
+                yield pending.popleft().result()
+            pending.append(executor.submit(func, item))
+        while pending:
+            yield pending.popleft().result()
+    
+    def _iter_chunks(self, segments: Iterable[str], max_tokens: int) -> Iterator[str]:
+        """
+        Pack normalized segments into chunks of at most max_tokens (estimated)
+        
+        Gives the same chunks for the same segments, holding at most one
+        segment and one partial chunk at a time.
+        """
+        carry = ""
+        for segment in segments:
+            chunks = self._split_into_chunks(f"{carry} {segment}" if carry else segment, max_tokens)
+            carry = chunks.pop() if chunks else ""
+            yield from chunks
+        if carry:
+            yield carry
+    
+    def _chunk_budget(self, max_words: int, language: str) -> tuple:
+        """Token budget for chunk text (leaving room for the instructions) and word target for partial summaries"""
+        overhead = self._estimate_tokens(self._create_chunk_prompt("", 1, 1, max_words, language))
+        return max(self.chunk_tokens - overhead, 1), max(max_words, 150)
+    
+    def _group_partials(self, partials: List[str], max_tokens: int) -> List[List[str]]:
+        """Pack consecutive partial summaries into groups that fit max_tokens, at least two per group"""
+        groups = []
+        current = []
+        current_tokens = 0
+        
+        for partial in partials:
+            tokens = self._estimate_tokens(partial)
+            if len(current) >= 2 and current_tokens + tokens > max_tokens:
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append(partial)
+            current_tokens += tokens
+        
+        if current:
+            groups.append(current)
+        
+        return groups
+    
+    def _cache_key(self, cleaned_text: str, style: str, max_words: int, language: str,
+                   route: Optional[str] = None) -> str:
+        """Build the cache key for a preprocessed text and summary options"""
+        return SummaryCache.make_key(cleaned_text, style, max_words, language, self._cache_model(route), self.temperature)
+    
+    def _cache_model(self, route: Optional[str] = None) -> str:
+        """
+        Model identifier in cache keys
+        
+        The routes a request may take and the extraction settings change
+        what is generated, so both are part of it.
+        """
+        model = self.router.signature(route)
+        if self.extractive_tokens is None:
+            return model
+        return f"{model}+{self.extractive_method}:{self.extractive_tokens}"
+    
+    def _flight_key(self, request: _PreparedRequest) -> str:
+        """Key under which identical concurrent requests are coalesced"""
+        route = request.route.name if request.route is not None else ""
+        return f"{request.cache_key}:{route}:{'chunked' if request.chunked else 'single'}"
+    
+    def count_tokens(self, text: str, style: str = "brief", max_words: int = 150, language: str = "english",
+                     normalization: Optional[str] = None) -> dict:
+        """
+        Estimate locally, without any network call, what summarizing text will cost
+        
+        Args:
+            text (str): Raw input text
+            style (str): Summary style
+            max_words (int): Maximum words in the summary
+            language (str): Output language
+            normalization (Optional[str]): Preprocessing profile
+            
+        Returns:
+            dict: Estimated text and prompt tokens, whether the chunked path will be
+                used and the expected number of model calls, reduce rounds included;
+                when extraction applies, everything but text_tokens is estimated for
+                the extracted text
+        """
+        cleaned_text = self._preprocess_text(text, normalization)
+        text_tokens = self._estimate_tokens(cleaned_text)
+        prompt_tokens = self._prompt_tokens(cleaned_text, style, max_words, language)
+        extracted = self._extracts(text_tokens)
+        if extracted:
+            # An upper bound: extraction keeps whole sentences within the budget
+            prompt_tokens = self._prompt_tokens("", style, max_words, language) + self.extractive_tokens
+        chunked = prompt_tokens > self.chunk_tokens
+        calls = 1
+        if chunked:
+            chunk_budget, _ = self._chunk_budget(max_words, language)
+            if extracted:
+                chunks = -(-self.extractive_tokens // chunk_budget)
+            else:
+                chunks = len(self._split_into_chunks(cleaned_text, chunk_budget))
+            calls = self._planned_calls(chunks, style, max_words, language)
+        
+        return {
+            "text_tokens": text_tokens,
+            "prompt_tokens": prompt_tokens,
+            "chunked": chunked,
+            "model_calls": calls
+        }
+    
+    def count_file_tokens(self, file: BinaryIO, style: str = "brief", max_words: int = 150,
+                          language: str = "english", normalization: Optional[str] = None,
+                          encoding: str = "utf-8") -> dict:
+        """
+        Estimate what summarizing a file will cost, reading it in pieces
+        
+        Takes the same arguments as summarize_file.
+        
+        Returns:
+            dict: The same estimates as count_tokens
+        """
+        scan = self._scan_file(file, style, max_words, language, normalization, encoding)
+        return {
+            "text_tokens": scan["text_tokens"],
+            "prompt_tokens": scan["prompt_tokens"],
+            "chunked": scan["chunks"] > 0,
+            "model_calls": self._planned_calls(scan["chunks"], style, max_words, language) if scan["chunks"] else 1
+        }
+    
+    def _planned_calls(self, chunks: int, style: str, max_words: int, language: str) -> int:
+        """
+        Model calls made by map-reduce over this many chunks, including every reduce round
+        
+        Partial summaries are assumed to fill their output budget and are
+        merged the way _map_reduce_prompt groups them.
+        """
+        chunk_budget, partial_words = self._chunk_budget(max_words, language)
+        partial_tokens = output_token_budget(partial_words, language)
+        # Each partial is also labelled in the reduce prompt
+        labelled_tokens = partial_tokens + self._estimate_tokens(f"\n\n[Part {chunks}]\n")
+        reduce_overhead = self._estimate_tokens(self._create_reduce_prompt([], style, max_words, language))
+        
+        calls = partials = chunks
+        while partials > 1 and reduce_overhead + partials * labelled_tokens > self.chunk_tokens:
+            partials = -(-partials // max(chunk_budget // partial_tokens, 2))
+            calls += partials
+        return calls + 1
+    
+    def summarize_text(self, text: str, style: str = "brief", max_words: int = 150, language: str = "english",
+                       chunked: Optional[bool] = None,
+                       normalization: Optional[str] = None,
+                       on_stage: Optional[Callable[[str, Optional[float]], None]] = None,
+                       return_result: bool = False, engine: Optional[str] = None,
+                       route: Optional[str] = None) -> Union[str, SummaryResult]:
         """
         Generate a summary of the provided text
         
@@ -104,57 +1116,782 @@ SUMMARY:
             style (str): Summary style - "brief", "detailed", or "bullet points"
             max_words (int): Maximum words in the summary
             language (str): Output language
+            chunked (Optional[bool]): Force (True) or disable (False) map-reduce
+                summarization; by default it is used when the prompt exceeds chunk_tokens
+            normalization (Optional[str]): Preprocessing profile for this call, "legacy"
+                or "unicode"; defaults to the profile given to the constructor
+            on_stage (Optional[Callable]): Called as on_stage(stage, None) when a pipeline
+                stage starts and on_stage(stage, seconds) when it finishes; stages are
+                "preprocess", "cache", "extract" (only when extraction applies), "prompt",
+                "model" and "postprocess"
+            return_result (bool): Return a SummaryResult with token, timing and cache
+                metadata instead of the bare summary
+            engine (Optional[str]): "abstractive" or "extractive" for this call; defaults
+                to the engine given to the constructor. Extractive summaries are built
+                locally from sentences of the input, in its language, and are not cached
+            route (Optional[str]): Name of the router's route to use for this call instead
+                of the one its size, style and length select
             
         Returns:
-            str: Generated summary
+            Union[str, SummaryResult]: Generated summary, or its SummaryResult if requested
             
         Raises:
             Exception: If summarization fails
         """
+        request = None
         try:
-            # Preprocess the input text
-            cleaned_text = self._preprocess_text(text)
+            timer = StageTimer(on_stage)
+            if self._engine(engine) == "extractive":
+                request = self._prepare_local(text, normalization, timer)
+                summary = self._summarize_locally(request, style, max_words, timer)
+                return self._result(request, summary, timer) if return_result else summary
             
-            if len(cleaned_text.split()) < 10:
-                raise Exception("Text is too short for meaningful summarization (minimum 10 words required)")
+            request = self._prepare(text, style, max_words, language, normalization, timer, route)
+            if request.cached is not None:
+                return self._result(request, request.cached, timer) if return_result else request.cached
             
-            # Create the prompt
-            prompt = self._create_prompt(cleaned_text, style, max_words, language)
+            with timer.stage("model"):
+                use_chunks = self._use_chunks(request, chunked)
+                
+                def generate() -> str:
+                    # Long documents are summarized chunk by chunk and then merged
+                    prompt = request.prompt
+                    if use_chunks:
+                        prompt = self._map_reduce_prompt(request, style, max_words, language)
+                    return self._invoke(prompt, request, self._output_budget(request, max_words, language))
+                
+                # Identical requests already in flight share that call's output
+                output, request.coalesced = self.single_flight.do(self._flight_key(request), generate)
             
-            # Create system and human messages
-            system_message = SystemMessage(
-                content="You are a professional text summarizer. Provide accurate, concise, and well-structured summaries."
-            )
-            human_message = HumanMessage(content=prompt)
+            with timer.stage("postprocess"):
+                summary = self._clean_summary(output)
+                self._store(request, summary)
+            
+            return self._result(request, summary, timer) if return_result else summary
+            
+        except Exception as e:
+            if not self._falls_back(request, e):
+                raise self._translate_error(e)
+            request.fallback = True
+            summary = self._summarize_locally(request, style, max_words, timer)
+            return self._result(request, summary, timer) if return_result else summary
+    
+    async def asummarize_text(self, text: str, style: str = "brief", max_words: int = 150, language: str = "english",
+                              chunked: Optional[bool] = None,
+                              normalization: Optional[str] = None,
+                              on_stage: Optional[Callable[[str, Optional[float]], None]] = None,
+                              return_result: bool = False, engine: Optional[str] = None,
+                              route: Optional[str] = None) -> Union[str, SummaryResult]:
+        """
+        Generate a summary without blocking a thread while the model responds
+        
+        Takes the same arguments as summarize_text.
+        
+        Returns:
+            Union[str, SummaryResult]: Generated summary, or its SummaryResult if requested
+            
+        Raises:
+            Exception: If summarization fails
+        """
+        request = None
+        try:
+            timer = StageTimer(on_stage)
+            if self._engine(engine) == "extractive":
+                request = self._prepare_local(text, normalization, timer)
+                summary = self._summarize_locally(request, style, max_words, timer)
+                return self._result(request, summary, timer) if return_result else summary
+            
+            request = self._prepare(text, style, max_words, language, normalization, timer, route)
+            if request.cached is not None:
+                return self._result(request, request.cached, timer) if return_result else request.cached
+            
+            with timer.stage("model"):
+                use_chunks = self._use_chunks(request, chunked)
+                
+                async def generate() -> str:
+                    prompt = request.prompt
+                    if use_chunks:
+                        prompt = await self._amap_reduce_prompt(request, style, max_words, language)
+                    return await self._ainvoke(prompt, request, self._output_budget(request, max_words, language))
+                
+                output, request.coalesced = await self.single_flight.ado(self._flight_key(request), generate)
+            
+            with timer.stage("postprocess"):
+                summary = self._clean_summary(output)
+                self._store(request, summary)
+            
+            return self._result(request, summary, timer) if return_result else summary
+            
+        except Exception as e:
+            if not self._falls_back(request, e):
+                raise self._translate_error(e)
+            request.fallback = True
+            summary = self._summarize_locally(request, style, max_words, timer)
+            return self._result(request, summary, timer) if return_result else summary
+    
+    def stream_summary(self, text: str, style: str = "brief", max_words: int = 150, language: str = "english",
+                       chunked: Optional[bool] = None,
+                       normalization: Optional[str] = None,
+                       on_stage: Optional[Callable[[str, Optional[float]], None]] = None,
+                       on_result: Optional[Callable[[SummaryResult], None]] = None,
+                       engine: Optional[str] = None, route: Optional[str] = None) -> Iterator[str]:
+        """
+        Generate a summary, yielding it piece by piece as the model produces it
+        
+        Takes the same arguments as summarize_text, except that metadata is
+        delivered by calling on_result(SummaryResult) once the stream ends.
+        For long documents the chunk summaries are produced first and the
+        final merge is streamed. A call that joins an identical request
+        already in flight, an extractive summary and a fallback (which only
+        happens before the first piece) are yielded as a single piece.
+        
+        Yields:
+            str: Consecutive pieces of the summary
             
-            # Generate summary
-            messages = [system_message, human_message]
-            response = self.model(messages)
+        Raises:
+            Exception: If summarization fails
+        """
+        request = None
+        started = False
+        try:
+            timer = StageTimer(on_stage)
+            if self._engine(engine) == "extractive":
+                request = self._prepare_local(text, normalization, timer)
+                summary = self._summarize_locally(request, style, max_words, timer)
+                yield summary
+                if on_result is not None:
+                    on_result(self._result(request, summary, timer))
+                return
+            
+            request = self._prepare(text, style, max_words, language, normalization, timer, route)
+            if request.cached is not None:
+                yield request.cached
+                if on_result is not None:
+                    on_result(self._result(request, request.cached, timer))
+                return
+            
+            with timer.stage("model"):
+                use_chunks = self._use_chunks(request, chunked)
+                
+                def build_prompt() -> str:
+                    if use_chunks:
+                        return self._map_reduce_prompt(request, style, max_words, language)
+                    return request.prompt
+                
+                pieces = []
+                for piece in self._stream_flight(request, build_prompt, self._output_budget(request, max_words, language)):
+                    pieces.append(piece)
+                    started = True
+                    yield piece
+                summary = "".join(pieces).strip()
+            
+            with timer.stage("postprocess"):
+                self._store(request, summary)
+            
+            if on_result is not None:
+                on_result(self._result(request, summary, timer))
+            
+        except Exception as e:
+            # Once part of the summary is out, the stream can only fail
+            if started or not self._falls_back(request, e):
+                raise self._translate_error(e)
+            request.fallback = True
+            summary = self._summarize_locally(request, style, max_words, timer)
+            yield summary
+            if on_result is not None:
+                on_result(self._result(request, summary, timer))
+    
+    async def astream_summary(self, text: str, style: str = "brief", max_words: int = 150, language: str = "english",
+                              chunked: Optional[bool] = None,
+                              normalization: Optional[str] = None,
+                              on_stage: Optional[Callable[[str, Optional[float]], None]] = None,
+                              on_result: Optional[Callable[[SummaryResult], None]] = None,
+                              engine: Optional[str] = None, route: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Async counterpart of stream_summary
+        
+        Yields:
+            str: Consecutive pieces of the summary
+            
+        Raises:
+            Exception: If summarization fails
+        """
+        request = None
+        started = False
+        try:
+            timer = StageTimer(on_stage)
+            if self._engine(engine) == "extractive":
+                request = self._prepare_local(text, normalization, timer)
+                summary = self._summarize_locally(request, style, max_words, timer)
+                yield summary
+                if on_result is not None:
+                    on_result(self._result(request, summary, timer))
+                return
+            
+            request = self._prepare(text, style, max_words, language, normalization, timer, route)
+            if request.cached is not None:
+                yield request.cached
+                if on_result is not None:
+                    on_result(self._result(request, request.cached, timer))
+                return
+            
+            with timer.stage("model"):
+                use_chunks = self._use_chunks(request, chunked)
+                key = self._flight_key(request)
+                flight, leader = await self.single_flight.aclaim(key)
+                while not leader:
+                    try:
+                        output = await self.single_flight.await_result(flight)
+                        break
+                    except FlightAbandoned:
+                        # The leader's client went away; take over the call or join whoever did
+                        flight, leader = await self.single_flight.aclaim(key)
+                if leader:
+                    pieces = []
+                    try:
+                        prompt = request.prompt
+                        if use_chunks:
+                            prompt = await self._amap_reduce_prompt(request, style, max_words, language)
+                        output_tokens = self._output_budget(request, max_words, language)
+                        async for piece in self._astream_prompt(prompt, request, output_tokens):
+                            pieces.append(piece)
+                            started = True
+                            yield piece
+                    except BaseException as e:
+                        self.single_flight.resolve(key, flight, error=e)
+                        raise
+                    summary = "".join(pieces).strip()
+                    self.single_flight.resolve(key, flight, summary)
+                else:
+                    request.coalesced = True
+                    summary = self._clean_summary(output)
+                    started = True
+                    yield summary
+            
+            with timer.stage("postprocess"):
+                self._store(request, summary)
+            
+            if on_result is not None:
+                on_result(self._result(request, summary, timer))
+            
+        except Exception as e:
+            # Once part of the summary is out, the stream can only fail
+            if started or not self._falls_back(request, e):
+                raise self._translate_error(e)
+            request.fallback = True
+            summary = self._summarize_locally(request, style, max_words, timer)
+            yield summary
+            if on_result is not None:
+                on_result(self._result(request, summary, timer))
+    
+    def summarize_file(self, file: BinaryIO, style: str = "brief", max_words: int = 150, language: str = "english",
+                       normalization: Optional[str] = None, encoding: str = "utf-8",
+                       on_stage: Optional[Callable[[str, Optional[float]], None]] = None,
+                       return_result: bool = False, engine: Optional[str] = None,
+                       route: Optional[str] = None) -> Union[str, SummaryResult]:
+        """
+        Generate a summary of a text file without loading it into memory
+        
+        The file is decoded and normalized in pieces. A first pass computes
+        the cache key and token estimate; if the text is too long for one
+        prompt, a second pass feeds its chunks to map-reduce summarization
+        as they are needed. Only a few chunks are held in memory at a time.
+        
+        Args:
+            file (BinaryIO): Seekable binary file, such as an upload, an open file or an mmap;
+                it is read from the beginning
+            style (str): Summary style - "brief", "detailed", or "bullet points"
+            max_words (int): Maximum words in the summary
+            language (str): Output language
+            normalization (Optional[str]): Preprocessing profile for this call
+            encoding (str): Text encoding of the file; undecodable bytes are replaced
+            on_stage (Optional[Callable]): Stage callback, as for summarize_text
+            return_result (bool): Return a SummaryResult instead of the bare summary
+            engine (Optional[str]): Engine for this call, as for summarize_text
+            route (Optional[str]): Route for this call, as for summarize_text
+            
+        Returns:
+            Union[str, SummaryResult]: Generated summary, or its SummaryResult if requested
+            
+        Raises:
+            Exception: If summarization fails
+        """
+        request = None
+        try:
+            timer = StageTimer(on_stage)
+            if self._engine(engine) == "extractive":
+                request = self._prepare_local_file(file, normalization, encoding, timer)
+                summary = self._summarize_locally(request, style, max_words, timer,
+                                                  self._file_segments(file, normalization, encoding))
+                return self._result(request, summary, timer) if return_result else summary
+            
+            request = self._prepare_file(file, style, max_words, language, normalization, encoding, timer, route)
+            if request.cached is not None:
+                return self._result(request, request.cached, timer) if return_result else request.cached
+            
+            with timer.stage("model"):
+                def generate() -> str:
+                    prompt = self._file_prompt(request, file, style, max_words, language, normalization, encoding)
+                    return self._invoke(prompt, request, self._output_budget(request, max_words, language))
+                
+                output, request.coalesced = self.single_flight.do(self._flight_key(request), generate)
+            
+            with timer.stage("postprocess"):
+                summary = self._clean_summary(output)
+                self._store(request, summary)
+            
+            return self._result(request, summary, timer) if return_result else summary
+            
+        except Exception as e:
+            if not self._falls_back(request, e):
+                raise self._translate_error(e)
+            request.fallback = True
+            # Chunked files were never held in memory, so they are read again
+            segments = None if request.cleaned_text else self._file_segments(file, normalization, encoding)
+            summary = self._summarize_locally(request, style, max_words, timer, segments)
+            return self._result(request, summary, timer) if return_result else summary
+    
+    def stream_file(self, file: BinaryIO, style: str = "brief", max_words: int = 150, language: str = "english",
+                    normalization: Optional[str] = None, encoding: str = "utf-8",
+                    on_stage: Optional[Callable[[str, Optional[float]], None]] = None,
+                    on_result: Optional[Callable[[SummaryResult], None]] = None,
+                    engine: Optional[str] = None, route: Optional[str] = None) -> Iterator[str]:
+        """
+        Generate a summary of a text file, yielding it piece by piece as the model produces it
+        
+        Reads the file like summarize_file and streams like stream_summary:
+        takes the same arguments as summarize_file, except that metadata is
+        delivered by calling on_result(SummaryResult) once the stream ends.
+        
+        Yields:
+            str: Consecutive pieces of the summary
+            
+        Raises:
+            Exception: If summarization fails
+        """
+        request = None
+        started = False
+        try:
+            timer = StageTimer(on_stage)
+            if self._engine(engine) == "extractive":
+                request = self._prepare_local_file(file, normalization, encoding, timer)
+                summary = self._summarize_locally(request, style, max_words, timer,
+                                                  self._file_segments(file, normalization, encoding))
+                yield summary
+                if on_result is not None:
+                    on_result(self._result(request, summary, timer))
+                return
             
-            # Extract and clean the summary
-            summary = response.content.strip()
+            request = self._prepare_file(file, style, max_words, language, normalization, encoding, timer, route)
+            if request.cached is not None:
+                yield request.cached
+                if on_result is not None:
+                    on_result(self._result(request, request.cached, timer))
+                return
             
-            # Remove any unwanted prefixes that the model might add
-            unwanted_prefixes = ["SUMMARY:", "Summary:", "Here is the summary:", "Here's the summary:"]
-            for prefix in unwanted_prefixes:
-                if summary.startswith(prefix):
-                    summary = summary[len(prefix):].strip()
+            with timer.stage("model"):
+                pieces = []
+                for piece in self._stream_flight(
+                    request,
+                    lambda: self._file_prompt(request, file, style, max_words, language, normalization, encoding),
+                    self._output_budget(request, max_words, language)
+                ):
+                    pieces.append(piece)
+                    started = True
+                    yield piece
+                summary = "".join(pieces).strip()
             
-            if not summary:
-                raise Exception("Generated summary is empty")
+            with timer.stage("postprocess"):
+                self._store(request, summary)
             
-            return summary
+            if on_result is not None:
+                on_result(self._result(request, summary, timer))
             
         except Exception as e:
-            # Provide more specific error messages
-            if "quota" in str(e).lower():
-                raise Exception("API quota exceeded. Please check your Google Cloud billing and quota limits.")
-            elif "authentication" in str(e).lower() or "api key" in str(e).lower():
-                raise Exception("Authentication failed. Please verify your Google API key is correct and has proper permissions.")
-            elif "timeout" in str(e).lower():
-                raise Exception("Request timed out. Please try again with shorter text or check your internet connection.")
+            # Once part of the summary is out, the stream can only fail
+            if started or not self._falls_back(request, e):
+                raise self._translate_error(e)
+            request.fallback = True
+            segments = None if request.cleaned_text else self._file_segments(file, normalization, encoding)
+            summary = self._summarize_locally(request, style, max_words, timer, segments)
+            yield summary
+            if on_result is not None:
+                on_result(self._result(request, summary, timer))
+    
+    async def asummarize_batch(self, texts: Iterable[str], style: str = "brief", max_words: int = 150,
+                               language: str = "english", concurrency: int = 8, **options) -> BatchResult:
+        """
+        Summarize many texts concurrently
+        
+        Args:
+            texts (Iterable[str]): Texts to summarize
+            style (str): Summary style - "brief", "detailed", or "bullet points"
+            max_words (int): Maximum words in each summary
+            language (str): Output language
+            concurrency (int): Maximum number of texts summarized at once
+            **options: Further keyword arguments passed to asummarize_text
+            
+        Returns:
+            BatchResult: One item per text in input order; failures are recorded, not raised
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def run(index: int, text: str) -> BatchItem:
+            async with semaphore:
+                try:
+                    return BatchItem(index, summary=await self.asummarize_text(text, style, max_words, language, **options))
+                except Exception as e:
+                    return BatchItem(index, error=str(e))
+        
+        start = time.perf_counter()
+        items = await asyncio.gather(*(run(i, text) for i, text in enumerate(texts)))
+        return BatchResult(items=list(items), elapsed=time.perf_counter() - start)
+    
+    def summarize_batch(self, texts: Iterable[str], style: str = "brief", max_words: int = 150,
+                        language: str = "english", concurrency: int = 8, **options) -> BatchResult:
+        """
+        Summarize many texts concurrently from synchronous code
+        
+        Takes the same arguments as asummarize_batch. Batches run on the model
+        pool's persistent event loop, which pooled async clients are bound to.
+        Use asummarize_batch from async code instead.
+        
+        Returns:
+            BatchResult: One item per text in input order; failures are recorded, not raised
+        """
+        return self.model_pool.run(self.asummarize_batch(texts, style, max_words, language, concurrency, **options))
+    
+    def _prepare(self, text: str, style: str, max_words: int, language: str, normalization: Optional[str],
+                 timer: StageTimer, route: Optional[str] = None) -> _PreparedRequest:
+        """
+        Preprocess the input, look it up in the cache, check the token budget and build the prompt
+        
+        Returns:
+            _PreparedRequest: Prepared request; prompt is None on a cache hit
+        """
+        # Preprocess the input text
+        with timer.stage("preprocess"):
+            cleaned_text = self._preprocess_text(text, normalization)
+            self._require_words([cleaned_text])
+        
+        request = _PreparedRequest(cleaned_text)
+        
+        # Serve repeated requests from the cache; the key also identifies in-flight requests
+        with timer.stage("cache"):
+            request.cache_key = self._cache_key(request.cleaned_text, style, max_words, language, route)
+            if self.cache is not None:
+                request.cached = self.cache.get(request.cache_key)
+        if request.cached is not None:
+            return request
+        
+        # Keep only the most salient sentences of long texts
+        if self._extracts(self._estimate_tokens(request.cleaned_text)):
+            with timer.stage("extract"):
+                request.cleaned_text = extract(request.cleaned_text, self.extractive_tokens, self.extractive_method)
+        
+        # Create the prompt
+        with timer.stage("prompt"):
+            request.prompt_tokens = self._prompt_tokens(request.cleaned_text, style, max_words, language)
+            if self.max_input_tokens is not None and request.prompt_tokens > self.max_input_tokens:
+                raise ValueError(
+                    f"Text is too long to summarize (about {request.prompt_tokens} tokens, "
+                    f"limit {self.max_input_tokens})"
+                )
+            request.prompt = self._create_prompt(request.cleaned_text, style, max_words, language)
+            request.route = self.router.select(request.prompt_tokens, style, max_words, route)
+        
+        return request
+    
+    def _require_words(self, segments: Iterable[str]):
+        """
+        Check that a text is long enough to summarize; only its first few words are looked at
+        
+        Raises:
+            ValueError: If the segments hold fewer than 10 words
+        """
+        words = 0
+        for segment in segments:
+            words += len(segment.split(None, 10 - words))
+            if words >= 10:
+                return
+        raise ValueError("Text is too short for meaningful summarization (minimum 10 words required)")
+    
+    def _prepare_local(self, text: str, normalization: Optional[str], timer: StageTimer) -> _PreparedRequest:
+        """Preprocess the input of an extractive call; nothing is cached or sent"""
+        with timer.stage("preprocess"):
+            cleaned_text = self._preprocess_text(text, normalization)
+            self._require_words([cleaned_text])
+        return _PreparedRequest(cleaned_text)
+    
+    def _prepare_local_file(self, file: BinaryIO, normalization: Optional[str], encoding: str,
+                            timer: StageTimer) -> _PreparedRequest:
+        """File counterpart of _prepare_local; the text is read again when it is summarized"""
+        with timer.stage("preprocess"):
+            self._require_words(self._file_segments(file, normalization, encoding))
+        return _PreparedRequest("")
+    
+    def _summarize_locally(self, request: _PreparedRequest, style: str, max_words: int, timer: StageTimer,
+                           segments: Optional[Iterable[str]] = None) -> str:
+        """
+        Build an extractive summary, without any model call
+        
+        Args:
+            request (_PreparedRequest): Prepared request; its cleaned text is summarized
+                unless segments are given
+            style (str): Summary style
+            max_words (int): Maximum words in the summary
+            timer (StageTimer): Timer of the call
+            segments (Optional[Iterable[str]]): Normalized segments of a file that is not
+                held in memory
+            
+        Returns:
+            str: Summary
+        """
+        request.engine = "extractive"
+        request.prompt_tokens = 0
+        with timer.stage("extract"):
+            if segments is not None:
+                return summarize_segments(segments, max_words, style, self.extractive_method)
+            return summarize(request.cleaned_text, max_words, style, self.extractive_method)
+    
+    def _engine(self, engine: Optional[str]) -> str:
+        """
+        Resolve the engine of a call
+        
+        Raises:
+            ValueError: If the engine is unknown
+        """
+        engine = engine or self.engine
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine!r} (expected one of {', '.join(ENGINES)})")
+        return engine
+    
+    def _falls_back(self, request: Optional[_PreparedRequest], error: Exception) -> bool:
+        """Whether a failed model call is answered with an extractive summary instead"""
+        return (
+            self.extractive_fallback
+            and request is not None
+            and request.engine == "abstractive"
+            and isinstance(error, FALLBACK_ERRORS)
+        )
+    
+    def _file_segments(self, file: BinaryIO, normalization: Optional[str], encoding: str) -> Iterator[str]:
+        """Rewind a file and yield its normalized segments"""
+        file.seek(0)
+        return iter_segments(iter_text(file, encoding=encoding), normalization or self.normalization)
+    
+    def _scan_file(self, file: BinaryIO, style: str, max_words: int, language: str,
+                   normalization: Optional[str], encoding: str, route: Optional[str] = None) -> dict:
+        """
+        Read a file once to compute its cache key, token estimate and chunk count
+        
+        Returns:
+            dict: cache_key, words (counted up to 10), text_tokens, prompt_tokens and
+                chunks (0 if the text fits in a single prompt); with extraction, prompt_tokens
+                and chunks are estimated for the extracted text
+        """
+        hasher = SummaryCache.key_hasher(style, max_words, language, self._cache_model(route), self.temperature)
+        scan = {"words": 0, "text_tokens": 0}
+        
+        def observed() -> Iterator[str]:
+            separator = b""
+            for segment in self._file_segments(file, normalization, encoding):
+                # Hash the text as it would be joined, so the key matches summarize_text's
+                hasher.update(separator + segment.encode("utf-8", "surrogatepass"))
+                separator = b" "
+                if scan["words"] < 10:
+                    scan["words"] += len(segment.split(None, 10 - scan["words"]))
+                scan["text_tokens"] += self._estimate_tokens(segment)
+                yield segment
+        
+        # Chunks are counted in this pass too, so chunk prompts can say "part i of n"
+        chunk_budget, _ = self._chunk_budget(max_words, language)
+        chunks = sum(1 for _ in self._iter_chunks(observed(), chunk_budget))
+        
+        scan["cache_key"] = hasher.hexdigest()
+        scan["prompt_tokens"] = self._prompt_tokens("", style, max_words, language) + scan["text_tokens"]
+        scan["chunks"] = chunks if scan["prompt_tokens"] > self.chunk_tokens else 0
+        if self._extracts(scan["text_tokens"]):
+            # Upper bounds, as in count_tokens
+            scan["prompt_tokens"] += self.extractive_tokens - scan["text_tokens"]
+            scan["chunks"] = -(-self.extractive_tokens // chunk_budget) if scan["prompt_tokens"] > self.chunk_tokens else 0
+        return scan
+    
+    def _prepare_file(self, file: BinaryIO, style: str, max_words: int, language: str,
+                      normalization: Optional[str], encoding: str, timer: StageTimer,
+                      route: Optional[str] = None) -> _PreparedRequest:
+        """
+        File counterpart of _prepare; only texts that fit in a single prompt are held in memory
+        
+        Returns:
+            _PreparedRequest: Prepared request; for chunked files cleaned_text is empty
+                and chunks holds the number of chunks, unless the text was extracted
+        """
+        with timer.stage("preprocess"):
+            scan = self._scan_file(file, style, max_words, language, normalization, encoding, route)
+            if scan["words"] < 10:
+                raise ValueError("Text is too short for meaningful summarization (minimum 10 words required)")
+        
+        request = _PreparedRequest("", prompt_tokens=scan["prompt_tokens"], cache_key=scan["cache_key"])
+        
+        with timer.stage("cache"):
+            if self.cache is not None:
+                request.cached = self.cache.get(request.cache_key)
+        if request.cached is not None:
+            return request
+        
+        # Each segment puts forward its most salient sentences; the best of them are kept
+        if self._extracts(scan["text_tokens"]):
+            with timer.stage("extract"):
+                request.cleaned_text = extract_segments(
+                    self._file_segments(file, normalization, encoding),
+                    self.extractive_tokens,
+                    scan["text_tokens"],
+                    self.extractive_method
+                )
+                request.prompt_tokens = self._prompt_tokens(request.cleaned_text, style, max_words, language)
+        
+        with timer.stage("prompt"):
+            if self.max_input_tokens is not None and request.prompt_tokens > self.max_input_tokens:
+                raise ValueError(
+                    f"Text is too long to summarize (about {request.prompt_tokens} tokens, "
+                    f"limit {self.max_input_tokens})"
+                )
+            if request.cleaned_text:
+                # Extracted text is held in memory and chunked from there if it is still too long
+                if request.prompt_tokens > self.chunk_tokens:
+                    request.chunked = True
+                else:
+                    request.prompt = self._create_prompt(request.cleaned_text, style, max_words, language)
+            elif scan["chunks"]:
+                request.chunked = True
+                request.chunks = scan["chunks"]
             else:
-                raise Exception(f"Summarization failed: {str(e)}")
+                request.cleaned_text = " ".join(self._file_segments(file, normalization, encoding))
+                request.prompt = self._create_prompt(request.cleaned_text, style, max_words, language)
+            request.route = self.router.select(request.prompt_tokens, style, max_words, route)
+        
+        return request
+    
+    def _file_prompt(self, request: _PreparedRequest, file: BinaryIO, style: str, max_words: int, language: str,
+                     normalization: Optional[str], encoding: str) -> str:
+        """Final prompt of a prepared file request; chunked files are read again chunk by chunk"""
+        if not request.chunked:
+            return request.prompt
+        chunks = None
+        if not request.cleaned_text:
+            chunk_budget, _ = self._chunk_budget(max_words, language)
+            chunks = self._iter_chunks(self._file_segments(file, normalization, encoding), chunk_budget)
+        return self._map_reduce_prompt(request, style, max_words, language, chunks)
+    
+    def _stream_flight(self, request: _PreparedRequest, build_prompt: Callable[[], str],
+                       output_tokens: int) -> Iterator[str]:
+        """
+        Stream the response to a prepared request, coalescing identical requests in flight
+        
+        Only the request that makes the model call builds its prompt; one
+        that joins an identical request already in flight yields that
+        request's summary as a single piece.
+        """
+        key = self._flight_key(request)
+        flight, leader = self.single_flight.claim(key)
+        while not leader:
+            try:
+                output = self.single_flight.wait(flight)
+                break
+            except FlightAbandoned:
+                # The leader's client went away; take over the call or join whoever did
+                flight, leader = self.single_flight.claim(key)
+        
+        if not leader:
+            request.coalesced = True
+            yield self._clean_summary(output)
+            return
+        
+        pieces = []
+        try:
+            for piece in self._stream_prompt(build_prompt(), request, output_tokens):
+                pieces.append(piece)
+                yield piece
+        except BaseException as e:
+            self.single_flight.resolve(key, flight, error=e)
+            raise
+        self.single_flight.resolve(key, flight, "".join(pieces).strip())
+    
+    def _store(self, request: _PreparedRequest, summary: str):
+        """
+        Cache a generated summary
+        
+        Summaries cut off at the output budget are not kept, and neither are
+        copies of another call's output: the call that generated it caches it.
+        """
+        if self.cache is not None and not request.truncated and not request.coalesced:
+            self.cache.set(request.cache_key, summary)
+    
+    def _result(self, request: _PreparedRequest, summary: str, timer: StageTimer) -> SummaryResult:
+        """Build the SummaryResult for a finished call"""
+        return SummaryResult(
+            summary=summary,
+            input_tokens=request.prompt_tokens,
+            output_tokens=self._estimate_tokens(summary),
+            timings=dict(timer.timings),
+            model_name=self._backend(request).model_name if request.engine == "abstractive" else "",
+            route=request.route.name if request.route is not None and request.engine == "abstractive" else None,
+            engine=request.engine,
+            cache_hit=request.cached is not None,
+            coalesced=request.coalesced,
+            retries=request.retries,
+            chunked=request.chunked,
+            truncated=request.truncated,
+            fallback=request.fallback,
+            summary_words=len(summary.split()),
+            summary_chars=len(summary)
+        )
+    
+    def _extracts(self, text_tokens: int) -> bool:
+        """Whether extraction is enabled and a text of this size needs it"""
+        return self.extractive_tokens is not None and text_tokens > self.extractive_tokens
+    
+    def _use_chunks(self, request: _PreparedRequest, chunked: Optional[bool]) -> bool:
+        """
+        Decide before any network call whether a request goes through map-reduce summarization
+        
+        Raises:
+            ValueError: If chunking is disabled and the prompt cannot fit the model context
+        """
+        if chunked is None:
+            chunked = request.prompt_tokens > self.chunk_tokens
+        elif not chunked and request.prompt_tokens > self.context_tokens:
+            raise ValueError(
+                f"Text is too long for a single request (about {request.prompt_tokens} tokens, "
+                f"model limit {self.context_tokens}); enable chunked summarization"
+            )
+        request.chunked = chunked
+        return chunked
+    
+    def _translate_error(self, e: Exception) -> Exception:
+        """Map a low-level failure to an exception with a user-facing message"""
+        # Provide more specific error messages, by error type first
+        if isinstance(e, BackendNotConfigured):
+            return Exception(str(e))
+        elif isinstance(e, CircuitOpenError):
+            return Exception(
+                f"The Gemini API is currently unavailable. Please try again in {max(e.retry_after, 1):.0f} seconds."
+            )
+        elif isinstance(e, TooManyRequests):
+            return Exception("API quota exceeded. Please check your Google Cloud billing and quota limits.")
+        elif isinstance(e, (Unauthenticated, PermissionDenied)):
+            return Exception("Authentication failed. Please verify your Google API key is correct and has proper permissions.")
+        elif isinstance(e, (DeadlineExceeded, TimeoutError)):
+            return Exception("Request timed out. Please try again with shorter text or check your internet connection.")
+        elif "quota" in str(e).lower():
+            return Exception("API quota exceeded. Please check your Google Cloud billing and quota limits.")
+        elif "authentication" in str(e).lower() or "api key" in str(e).lower():
+            return Exception("Authentication failed. Please verify your Google API key is correct and has proper permissions.")
+        elif "timeout" in str(e).lower():
+            return Exception("Request timed out. Please try again with shorter text or check your internet connection.")
+        else:
+            return Exception(f"Summarization failed: {str(e)}")
     
     def validate_api_key(self) -> bool:
         """
@@ -166,22 +1903,37 @@ SUMMARY:
         try:
             # Test with a simple prompt
             test_message = HumanMessage(content="Hello, please respond with 'API key is working'")
-            response = self.model([test_message])
-            return bool(response.content)
+            return bool(self.backend.invoke([test_message]))
         except:
             return False
     
+    async def avalidate_api_key(self) -> bool:
+        """
+        Async counterpart of validate_api_key
+        
+        Returns:
+            bool: True if API key is valid, False otherwise
+        """
+        try:
+            test_message = HumanMessage(content="Hello, please respond with 'API key is working'")
+            return bool(await self.backend.ainvoke([test_message]))
+        except Exception:
+            return False
+    
     def get_model_info(self) -> dict:
         """
         Get information about the current model
         
+        Output budgets are set per call from max_words and language (see
+        _output_budget), so none is reported here.
+        
         Returns:
             dict: Model information
         """
         return {
-            "model_name": "gemini-1.5-flash",
-            "provider": "Google",
-            "framework": "LangChain",
-            "max_tokens": 1024,
-            "temperature": 0.3
+            "model_name": self.model_name,
+            "provider": self.backend.provider,
+            "framework": "LangChain" if isinstance(self.backend, GeminiBackend) else None,
+            "temperature": self.temperature,
+            "routes": self.router.describe()
         }
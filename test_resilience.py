@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import pytest
+from google.api_core.exceptions import ServiceUnavailable
+
+from backends import FakeBackend, constant
+from resilience import CircuitBreaker, HedgingPolicy, RetryPolicy
+from summarizer import TextSummarizer
+
+TEXT = "The quick brown fox jumps over the lazy dog near the river bank. " * 5
+
+
+def half_open_summarizer():
+    """A summarizer whose breaker has just been opened and let its open period pass"""
+    backend = FakeBackend(latency=constant(10.0))
+    breaker = CircuitBreaker(min_calls=1, open_seconds=0.01)
+    summarizer = TextSummarizer(backend=backend, circuit_breaker=breaker, retry_policy=RetryPolicy(max_attempts=1))
+    breaker.allow()
+    breaker.record(ServiceUnavailable("down"))
+    assert breaker.state == CircuitBreaker.OPEN
+    time.sleep(0.02)
+    return summarizer, backend, breaker
+
+
+async def cancel_probe(coroutine, breaker: CircuitBreaker):
+    """Start a call, wait until it is the half-open probe, then cancel it"""
+    task = asyncio.ensure_future(coroutine)
+    await asyncio.sleep(0.05)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+def test_release_frees_half_open_probe():
+    breaker = CircuitBreaker(min_calls=1, open_seconds=0.0)
+    breaker.allow()
+    breaker.record(ServiceUnavailable("down"))
+    breaker.allow()
+    breaker.release()
+    breaker.allow()
+    breaker.record()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_cancelled_probe_does_not_wedge_breaker():
+    summarizer, backend, breaker = half_open_summarizer()
+    asyncio.run(cancel_probe(summarizer.asummarize_text(TEXT), breaker))
+
+    backend.latency = constant(0.0)
+    assert summarizer.summarize_text(TEXT)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_cancelled_stream_probe_does_not_wedge_breaker():
+    summarizer, backend, breaker = half_open_summarizer()
+
+    async def consume():
+        return "".join([piece async for piece in summarizer.astream_summary(TEXT)])
+
+    asyncio.run(cancel_probe(consume(), breaker))
+
+    backend.latency = constant(0.0)
+    assert "".join(summarizer.stream_summary(TEXT))
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_cancelled_hedged_call_leaves_no_requests_running():
+    backend = FakeBackend(latency=constant(1.0))
+    summarizer = TextSummarizer(backend=backend, hedging=HedgingPolicy(initial_delay=0.5))
+
+    async def scenario():
+        task = asyncio.ensure_future(summarizer.asummarize_text(TEXT))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0)
+        assert [t for t in asyncio.all_tasks() if t is not asyncio.current_task()] == []
+        assert backend.in_flight == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,65 @@
+import math
+
+# Average characters per token for Latin-script text with Gemini's tokenizer
+CHARS_PER_TOKEN = 4
+
+# Average tokens per word of generated text; languages with longer words or
+# richer inflection take more, and unlisted languages get DEFAULT_TOKENS_PER_WORD
+TOKENS_PER_WORD = {
+    "english": 1.4,
+    "spanish": 1.7,
+    "french": 1.7,
+    "italian": 1.7,
+    "portuguese": 1.7,
+    "german": 1.9,
+}
+DEFAULT_TOKENS_PER_WORD = 2.5
+
+# Models overshoot "approximately N words", and bullets and headings add markup
+OUTPUT_HEADROOM = 1.3
+OUTPUT_OVERHEAD_TOKENS = 32
+
+# Bounds for a single response
+MIN_OUTPUT_TOKENS = 64
+MAX_OUTPUT_TOKENS = 8192
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in text without calling the API
+
+    ASCII characters are counted at CHARS_PER_TOKEN per token. Every
+    non-ASCII character is counted as a whole token, which is close for
+    CJK text and errs on the high side for accented Latin text, so
+    budgets derived from it stay conservative.
+
+    Args:
+        text (str): Text to measure
+
+    Returns:
+        int: Estimated token count
+    """
+    if text.isascii():
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return math.ceil(ascii_chars / CHARS_PER_TOKEN) + (len(text) - ascii_chars)
+
+
+def output_token_budget(max_words: int, language: str = "english") -> int:
+    """
+    Output tokens to allow for a summary of about max_words words
+
+    Generation time grows with output length, so short summaries get a
+    tight cap, while long ones keep enough headroom not to be cut off.
+
+    Args:
+        max_words (int): Requested summary length in words
+        language (str): Output language
+
+    Returns:
+        int: Value for the model's max_output_tokens
+    """
+    per_word = TOKENS_PER_WORD.get(language.lower(), DEFAULT_TOKENS_PER_WORD)
+    budget = math.ceil(max_words * per_word * OUTPUT_HEADROOM) + OUTPUT_OVERHEAD_TOKENS
+    return min(max(budget, MIN_OUTPUT_TOKENS), MAX_OUTPUT_TOKENS)